@@ -0,0 +1,61 @@
+# benchmarks/bench_browser.py
+# ✅ Stock Chrome vs the lean browser profile (BROWSER_PROFILE=default / lean) on the Selenium engine:
+# per-row p50/p95, rows/s and peak memory of the app plus its browsers, flow by flow.
+# Each profile runs bench_lookups.py in its own process (the profile is read at import time) against a
+# stub whose pages pull in stylesheets / images / fonts and repeat the form above each answer.
+#
+# Run:   python benchmarks/bench_browser.py --rows 200 --workers 2
+#        python benchmarks/bench_browser.py --rows 100 --flows mbbs_user_id --assets 12 --asset-latency 0.05 \
+#            --latency 0.2 --json browser.json
+
+import os
+import sys
+import json
+import argparse
+import tempfile
+import subprocess
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+PROFILES = ("default", "lean")
+COMPARED = ("p50_seconds", "p95_seconds", "rows_per_second", "peak_rss_mb")
+
+
+def run_profile(profile, args):
+    output = os.path.join(tempfile.mkdtemp(prefix="bench_browser_"), f"{profile}.json")
+    command = [sys.executable, os.path.join(HERE, "bench_lookups.py"), "--engine", "selenium",
+               "--workers", str(args.workers), "--rows", str(args.rows), "--latency", str(args.latency),
+               "--assets", str(args.assets), "--asset-latency", str(args.asset_latency), "--json", output]
+    if args.form_on_result:
+        command.append("--form-on-result")
+    if args.flows:
+        command += ["--flows", *args.flows]
+    print(f"== BROWSER_PROFILE={profile}", flush=True)
+    subprocess.run(command, env=dict(os.environ, BROWSER_PROFILE=profile), check=True)
+    with open(output, encoding="utf-8") as f:
+        return {r["flow"]: r for r in json.load(f)["results"]}
+
+
+def main(args):
+    runs = {profile: run_profile(profile, args) for profile in PROFILES}
+    print()
+    print(f"{'flow':<18}" + "".join(f"{f'{c} {p}':>24}" for c in COMPARED for p in PROFILES))
+    for flow in runs["default"]:
+        print(f"{flow:<18}" + "".join(f"{runs[p][flow][c]:>24}" for c in COMPARED for p in PROFILES))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"settings": vars(args), "results": runs}, f, indent=2)
+    return runs
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the stock and lean Chrome profiles on the Selenium engine")
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--flows", nargs="*", help="lookup kinds to run (default: all six)")
+    parser.add_argument("--latency", type=float, default=0.05, help="stub page response time in seconds")
+    parser.add_argument("--assets", type=int, default=9, help="stylesheets / images / fonts per stub page")
+    parser.add_argument("--asset-latency", type=float, default=0.02, help="seconds to serve each asset")
+    parser.add_argument("--no-form-on-result", dest="form_on_result", action="store_false",
+                        help="answer pages without the form (every row reloads the form page)")
+    parser.add_argument("--json", help="also write the results here")
+    main(parser.parse_args())
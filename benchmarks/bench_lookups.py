@@ -0,0 +1,283 @@
+# benchmarks/bench_lookups.py
+# ✅ End-to-end throughput of every lookup flow against the local stub upstream (stub_upstream.py).
+# Builds synthetic XLSX / DOCX rosters, runs each lookup's /process endpoint through the Flask test
+# client exactly as the pages do, and reports rows/s, per-row p50/p95, peak RSS and browsers started.
+#
+# Run:   python benchmarks/bench_lookups.py --rows 100 1000 10000 --engine http --workers 8
+#        python benchmarks/bench_lookups.py --rows 100 --formats docx --flows mbbs_result mbbs_user_id \
+#            --latency 0.2 --jitter 0.1 --error-rate 0.02 --engine selenium --workers 2
+#        python benchmarks/bench_lookups.py --rows 100000 --engine async --workers 50 --json bench.json
+#        python benchmarks/bench_lookups.py --rows 500 --engine tabs --workers 4      # one Chrome, 4 tabs:
+#        python benchmarks/bench_lookups.py --rows 500 --engine selenium --workers 4  # vs 4 Chromes (peak_rss_mb)
+#
+# RSS covers this process and its children (chromedriver / Chrome); Linux /proc is used when present.
+
+import os
+import sys
+import json
+import time
+import zipfile
+import argparse
+import tempfile
+import threading
+from xml.sax.saxutils import escape
+
+from openpyxl import Workbook
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from benchmarks.stub_upstream import start_stub  # noqa: E402
+
+ROSTER_COLUMNS = ("MBBS_Roll", "BDS_Roll", "Name", "Father's Name", "Mobile Number", "USER_ID")
+
+# Column parameters each flow sends to /process for XLSX rosters (DOCX rosters use the fixed columns)
+FLOW_PARAMS = {
+    "result": {"roll_col": "{EXAM}_Roll"},
+    "user_id": {"name_col": "Name", "father_col": "Father's Name", "mobile_col": "Mobile Number"},
+    "pass_recover": {"user_col": "USER_ID", "mobile_col": "Mobile Number"},
+}
+
+
+# 🧪 Synthetic roster rows; every `duplicate_every`-th row repeats the one before it
+def roster_rows(rows, duplicate_every=0):
+    previous = None
+    for i in range(rows):
+        if duplicate_every and previous and i % duplicate_every == 0:
+            yield previous
+            continue
+        previous = (str(100000 + i), str(200000 + i), f"Student {i}", f"Father {i}",
+                    f"17{i:08d}", f"U{i:07d}")
+        yield previous
+
+
+def write_xlsx(path, rows, duplicate_every=0):
+    book = Workbook(write_only=True)
+    sheet = book.create_sheet()
+    sheet.append(ROSTER_COLUMNS)
+    for row in roster_rows(rows, duplicate_every):
+        sheet.append(row)
+    book.save(path)
+
+
+# Minimal WordprocessingML package with one table: enough for readers.py and for Word itself
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '</Types>'
+)
+_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Target="word/document.xml" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"/>'
+    '</Relationships>'
+)
+
+
+def _docx_row(values):
+    cells = "".join(f"<w:tc><w:p><w:r><w:t>{escape(v)}</w:t></w:r></w:p></w:tc>" for v in values)
+    return f"<w:tr>{cells}</w:tr>"
+
+
+def write_docx(path, rows, duplicate_every=0):
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", _CONTENT_TYPES)
+        archive.writestr("_rels/.rels", _RELS)
+        with archive.open("word/document.xml", "w") as doc:
+            doc.write(b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?><w:document '
+                      b'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:body><w:tbl>')
+            doc.write(_docx_row(ROSTER_COLUMNS).encode("utf-8"))
+            for row in roster_rows(rows, duplicate_every):
+                doc.write(_docx_row(row).encode("utf-8"))
+            doc.write(b"</w:tbl></w:body></w:document>")
+
+
+# 📏 Resident memory of this process and all of its descendants, in bytes
+def tree_rss():
+    if not os.path.isdir("/proc"):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    children, rss = {}, {}
+    for pid in filter(str.isdigit, os.listdir("/proc")):
+        try:
+            with open(f"/proc/{pid}/stat") as f:
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+            with open(f"/proc/{pid}/statm") as f:
+                rss[int(pid)] = int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(pid))
+    total, stack = 0, [os.getpid()]
+    while stack:
+        pid = stack.pop()
+        total += rss.get(pid, 0)
+        stack += children.get(pid, [])
+    return total
+
+
+class PeakSampler:
+    def __init__(self, interval=0.1):
+        self.interval = interval
+        self.peak_rss = 0
+        self.peak_browsers = 0
+        self._stop = threading.Event()
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+
+    def _sample(self):
+        from blueprints.driver_pool import pool_stats
+        self.peak_rss = max(self.peak_rss, tree_rss())
+        stats = pool_stats()
+        if stats:
+            self.peak_browsers = max(self.peak_browsers, stats["alive"])
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._sample()
+            self._stop.wait(self.interval)
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))] if values else 0.0
+
+
+# ✅ One flow over one roster: drain the SSE stream and time every batch of rows
+def run_flow(client, definition, roster, fmt, engine, workers, output_format):
+    exam, _, flow = definition.kind.partition("_")
+    params = {"file_path": roster, "engine": engine, "workers": workers, "format": output_format}
+    if fmt == "xlsx":
+        params.update({k: v.replace("{EXAM}", exam.upper()) for k, v in FLOW_PARAMS[flow].items()})
+
+    from blueprints.driver_pool import pool_stats
+    created_before = (pool_stats() or {}).get("created", 0)
+    gaps, final, first_row_at, last = [], {}, None, None
+    with PeakSampler() as sampler:
+        started = time.perf_counter()
+        response = client.get(f"{definition.url}/process", query_string=params, buffered=False)
+        for chunk in response.response:
+            for line in chunk.decode("utf-8").splitlines():
+                if not line.startswith("data: "):
+                    continue
+                event = json.loads(line[6:])
+                now = time.perf_counter()
+                if "rows" in event:
+                    # A batch of n rows: spread the gap since the previous batch over them
+                    first_row_at = first_row_at or now
+                    gap = (now - (last or started)) / max(1, len(event["rows"]))
+                    gaps += [gap] * len(event["rows"])
+                    last = now
+                if "error" in event:
+                    raise RuntimeError(f"{definition.kind}: {event['error']}")
+                if "download" in event:
+                    final = event
+        elapsed = time.perf_counter() - started
+        response.close()
+
+    metrics = final.get("metrics", {})
+    result = {
+        "flow": definition.kind, "format": fmt, "rows": final.get("total_rows", 0), "engine": engine,
+        "workers": workers, "seconds": round(elapsed, 3),
+        "rows_per_second": round(final.get("processed", 0) / elapsed, 1) if elapsed else 0.0,
+        "first_row_seconds": round(first_row_at - started, 3) if first_row_at else None,
+        "p50_seconds": metrics.get("row_p50_seconds") or round(percentile(gaps, 50), 4),
+        "p95_seconds": metrics.get("row_p95_seconds") or round(percentile(gaps, 95), 4),
+        "found": final.get("found", 0), "not_found": final.get("not_found", 0),
+        "errors": final.get("error_count", 0), "retries": final.get("Retries", 0),
+        "peak_rss_mb": round(sampler.peak_rss / 2 ** 20, 1),
+        "browsers": (pool_stats() or {}).get("created", 0) - created_before,
+        "peak_browsers": sampler.peak_browsers,
+    }
+    _remove_result(final)
+    return result
+
+
+def _remove_result(final):
+    from blueprints.lookup_jobs import RESULT_FOLDER
+    name = final.get("download", "").partition("file=")[2]
+    if name:
+        try:
+            os.remove(os.path.join(RESULT_FOLDER, name))
+        except OSError:
+            pass
+
+
+COLUMNS = ("flow", "format", "rows", "engine", "workers", "seconds", "rows_per_second", "first_row_seconds",
+           "p50_seconds", "p95_seconds", "errors", "retries", "peak_rss_mb", "browsers")
+
+
+def print_row(values):
+    widths = [18] + [max(len(c), 6) for c in COLUMNS[1:]]
+    print("  ".join(f"{str(v):<{w}}" if i == 0 else f"{str(v):>{w}}"
+                    for i, (w, v) in enumerate(zip(widths, values))), flush=True)
+
+
+def main(args):
+    folder = tempfile.mkdtemp(prefix="bench_lookups_")
+    server, base = start_stub(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                              not_found_rate=args.not_found_rate, seed=args.seed, assets=args.assets,
+                              asset_latency=args.asset_latency, form_on_result=args.form_on_result)
+    # Everything the app reads at import time must be set before it is imported
+    os.environ["TELETALK_BASE_URL"] = os.environ["DGHS_BASE_URL"] = base
+    os.environ.setdefault("LOOKUP_CACHE_ENABLED", "1" if args.cache else "0")
+    os.environ.setdefault("JOBS_FOLDER", os.path.join(folder, "jobs"))
+    os.environ.setdefault("RATE_LIMIT_DEFAULT", "0")
+
+    from app import app
+    from blueprints.lookup_definitions import LOOKUP_JOBS
+
+    client = app.test_client()
+    definitions = [d for d in LOOKUP_JOBS if not args.flows or d.kind in args.flows]
+    results = []
+    print_row(COLUMNS)
+    try:
+        for rows in args.rows:
+            for fmt in args.formats:
+                roster = os.path.join(folder, f"roster_{rows}.{fmt}")
+                (write_xlsx if fmt == "xlsx" else write_docx)(roster, rows, args.duplicate_every)
+                for definition in definitions:
+                    result = run_flow(client, definition, roster, fmt, args.engine, args.workers, args.output)
+                    results.append(result)
+                    print_row([result[c] for c in COLUMNS])
+                os.remove(roster)
+    finally:
+        server.shutdown()
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"settings": vars(args), "results": results}, f, indent=2)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark every lookup flow against the local stub upstream")
+    parser.add_argument("--rows", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--formats", nargs="+", choices=("xlsx", "docx"), default=["xlsx"])
+    parser.add_argument("--flows", nargs="*", help="lookup kinds to run (default: all six)")
+    parser.add_argument("--engine", choices=("selenium", "http", "async", "tabs"), default="http")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--output", choices=("xlsx", "csv", "parquet"), default="xlsx", help="result file format")
+    parser.add_argument("--latency", type=float, default=0.0, help="stub response time in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of stub posts answered with 503")
+    parser.add_argument("--not-found-rate", type=float, default=0.2)
+    parser.add_argument("--assets", type=int, default=0, help="stylesheets / images / fonts per stub page")
+    parser.add_argument("--asset-latency", type=float, default=0.0, help="seconds to serve each asset")
+    parser.add_argument("--form-on-result", action="store_true", help="stub answer pages repeat the form")
+    parser.add_argument("--duplicate-every", type=int, default=0, help="repeat every n-th roster row")
+    parser.add_argument("--cache", action="store_true", help="keep the lookup cache on (off by default)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="also write the results here, for comparing runs")
+    main(parser.parse_args())
@@ -0,0 +1,66 @@
+# benchmarks/bench_merge.py
+# ✅ Compare the old per-entry mask merge with the keyed merge used by generate_result.
+#
+# Run:   python benchmarks/bench_merge.py --sizes 1000 5000 20000 --legacy-max 5000
+
+import os
+import sys
+import time
+import argparse
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from blueprints.result_merge import merge_results  # noqa: E402
+
+
+def make_sheet(rows, duplicate_every=50):
+    rolls = [str(100000 + i) for i in range(rows)]
+    # A few repeated rolls (and stray whitespace) like real uploads
+    for i in range(duplicate_every, rows, duplicate_every):
+        rolls[i] = f" {rolls[i - 1]} "
+    df = pd.DataFrame({"MBBS_Roll": rolls, "Name": [f"Student {i}" for i in range(rows)]})
+    result_data = []
+    for roll in df["MBBS_Roll"].astype(str).str.strip():
+        entry = {"MBBS_Roll": roll}
+        for i in range(7):
+            entry[f"Result_{i + 1}"] = f"{roll}-{i}"
+        result_data.append(entry)
+    return df, result_data
+
+
+# The pre-join implementation, kept here only as the baseline
+def legacy_merge(df, roll_col, result_data, key_col):
+    final_df = df.copy()
+    for entry in result_data:
+        mask = final_df[roll_col].astype(str).str.strip() == entry[key_col]
+        for key, val in entry.items():
+            if key != key_col:
+                final_df.loc[mask, key] = val
+    return final_df
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    out = fn(*args)
+    return out, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the result merge")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 2000, 5000, 20000])
+    parser.add_argument("--legacy-max", type=int, default=5000, help="skip the O(n²) baseline above this size")
+    args = parser.parse_args()
+
+    print(f"{'rows':>8} {'legacy (s)':>12} {'keyed (s)':>12} {'speedup':>9}")
+    for rows in args.sizes:
+        df, result_data = make_sheet(rows)
+        merged, keyed_time = timed(merge_results, df, "MBBS_Roll", result_data, "MBBS_Roll")
+
+        if rows <= args.legacy_max:
+            expected, legacy_time = timed(legacy_merge, df, "MBBS_Roll", result_data, "MBBS_Roll")
+            pd.testing.assert_frame_equal(merged, expected, check_dtype=False)
+            print(f"{rows:>8} {legacy_time:>12.3f} {keyed_time:>12.4f} {legacy_time / keyed_time:>8.0f}x")
+        else:
+            print(f"{rows:>8} {'-':>12} {keyed_time:>12.4f} {'-':>9}")
@@ -0,0 +1,50 @@
+# benchmarks/bench_roster_cache.py
+# ✅ The roster reads one lookup job makes (columns, row count, dedup pass, result-file pass, lookup pass)
+# without the parsed-roster cache, on the run that fills it, and on a run served from it.
+#
+# Run:   python benchmarks/bench_roster_cache.py --rows 10000 100000 --formats xlsx docx
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from benchmarks.bench_lookups import write_docx, write_xlsx  # noqa: E402
+
+
+def job_reads(readers, path):
+    started = time.perf_counter()
+    readers.read_columns(path)
+    readers.count_rows(path)
+    for _ in range(3):
+        for _ in readers.iter_rows(path):
+            pass
+    return time.perf_counter() - started
+
+
+def main(args):
+    folder = tempfile.mkdtemp(prefix="bench_roster_cache_")
+    os.environ["ROSTER_CACHE_FOLDER"] = os.path.join(folder, "parsed")
+    from blueprints import readers
+
+    print(f"{'format':<8}{'rows':>8}{'no cache s':>12}{'first run s':>13}{'cached s':>10}{'speedup':>9}")
+    for rows in args.rows:
+        for fmt in args.formats:
+            path = os.path.join(folder, f"roster_{rows}.{fmt}")
+            (write_xlsx if fmt == "xlsx" else write_docx)(path, rows)
+            readers.ROSTER_CACHE_ENABLED = False
+            plain = job_reads(readers, path)
+            readers.ROSTER_CACHE_ENABLED = True
+            first = job_reads(readers, path)
+            cached = job_reads(readers, path)
+            print(f"{fmt:<8}{rows:>8}{plain:>12.3f}{first:>13.3f}{cached:>10.3f}{plain / cached:>8.1f}x", flush=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Roster reads of one job with and without the parsed cache")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000])
+    parser.add_argument("--formats", nargs="+", choices=("xlsx", "docx"), default=["xlsx", "docx"])
+    main(parser.parse_args())
@@ -0,0 +1,88 @@
+# benchmarks/bench_startup.py
+# ✅ Cold start of a web worker: time to import the app and serve its first page, resident memory
+# afterwards, and which heavy libraries got loaded. Each run is a fresh interpreter.
+#
+# Run:   python benchmarks/bench_startup.py --runs 10
+#        git worktree add /tmp/before HEAD~1
+#        python benchmarks/bench_startup.py --repo . /tmp/before --json startup.json
+
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+import tempfile
+
+HEAVY = ("selenium", "webdriver_manager", "requests", "openpyxl", "pandas", "numpy", "aiohttp", "docx", "pyarrow")
+
+# Runs in the child: everything the app creates at import time goes to a scratch folder
+CHILD = r"""
+import os, sys, json, time, resource
+started = time.perf_counter()
+sys.path.insert(0, os.getcwd())
+import app
+imported = time.perf_counter()
+client = app.app.test_client()
+status = client.get("/").status_code
+served = time.perf_counter()
+rss = 0
+if os.path.exists("/proc/self/status"):
+    with open("/proc/self/status") as f:
+        rss = next(int(line.split()[1]) for line in f if line.startswith("VmRSS:")) * 1024
+else:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+print(json.dumps({
+    "import_seconds": imported - started, "first_page_seconds": served - started, "status": status,
+    "rss": rss, "modules": len(sys.modules),
+    "heavy": sorted(m for m in HEAVY if m in sys.modules),
+}))
+"""
+
+
+def run_once(repo, scratch):
+    env = dict(os.environ, JOBS_FOLDER=os.path.join(scratch, "jobs"),
+               USERS_FILE=os.path.join(scratch, "users.json"),
+               ACTIVITY_LOG_FILE=os.path.join(scratch, "activity.log"),
+               ACTIVITY_INDEX_PATH=os.path.join(scratch, "activity.sqlite"))
+    code = f"HEAVY = {HEAVY!r}\n{CHILD}"
+    output = subprocess.run([sys.executable, "-c", code], cwd=repo, env=env, capture_output=True, text=True,
+                            check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def measure(repo, runs):
+    scratch = tempfile.mkdtemp(prefix="bench_startup_")
+    samples = [run_once(repo, scratch) for _ in range(runs)]
+    median = lambda key: statistics.median(s[key] for s in samples)  # noqa: E731
+    return {
+        "repo": os.path.abspath(repo), "runs": runs,
+        "import_ms": round(median("import_seconds") * 1000, 1),
+        "first_page_ms": round(median("first_page_seconds") * 1000, 1),
+        "rss_mb": round(median("rss") / 2 ** 20, 1),
+        "modules": int(median("modules")),
+        "heavy": samples[-1]["heavy"],
+    }
+
+
+def main(args):
+    results = []
+    print(f"{'repo':<32} {'import_ms':>10} {'first_page_ms':>14} {'rss_mb':>8} {'modules':>8}  heavy libraries loaded")
+    for repo in args.repo:
+        result = measure(repo, args.runs)
+        results.append(result)
+        print(f"{result['repo'][-32:]:<32} {result['import_ms']:>10} {result['first_page_ms']:>14} "
+              f"{result['rss_mb']:>8} {result['modules']:>8}  {', '.join(result['heavy']) or '-'}", flush=True)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"settings": vars(args), "results": results}, f, indent=2)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure web worker cold start (import time, first page, RSS)")
+    parser.add_argument("--repo", nargs="+", default=[os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")],
+                        help="checkouts to compare (default: this one)")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--json", help="also write the results here")
+    main(parser.parse_args())
@@ -0,0 +1,132 @@
+# benchmarks/stress_users.py
+# ✅ Many processes editing one users.json at once, as separate gunicorn workers would.
+# Each writer adds its own users and bumps a shared counter with optimistic retries;
+# readers keep loading the file. At the end nothing may be lost and no read may come back empty.
+#
+# Run:   python benchmarks/stress_users.py --writers 8 --ops 50 --readers 4
+#        python benchmarks/stress_users.py --legacy   (the old open("w") + json.dump save, for comparison)
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import multiprocessing as mp
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from blueprints.user_store import UserStore, VersionConflict, user_version  # noqa: E402
+
+
+# The pre-lock implementation, kept here only as the baseline
+def legacy_load(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return []
+
+
+def legacy_save(path, users):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(users, f, indent=2)
+
+
+def writer(path, n, ops, legacy, results):
+    store = UserStore(path)
+    conflicts = 0
+    for i in range(ops):
+        user = {"user_id": f"w{n}-{i}", "pin": f"{n:03d}{i:04d}", "permissions": [], "info": {}}
+        if legacy:
+            legacy_save(path, legacy_load(path) + [user])
+        else:
+            store.add(user)
+
+        # Shared counter: read, add one, write back only if nobody saved in between
+        while True:
+            if legacy:
+                users = legacy_load(path)
+                counter = next((u for u in users if u.get("user_id") == "counter"), None)
+                if counter is None:
+                    break  # the file was read mid-write and came back empty
+                counter["info"] = {"count": counter["info"].get("count", 0) + 1}
+                legacy_save(path, users)
+                break
+            counter = store.get("counter")
+            try:
+                store.update("counter", {"info": {"count": counter["info"].get("count", 0) + 1}},
+                             version=user_version(counter))
+                break
+            except VersionConflict:
+                conflicts += 1
+    results.put(("writer", conflicts))
+
+
+def reader(path, stop, legacy, results):
+    store = UserStore(path)
+    reads = empty = errors = 0
+    while not stop.is_set():
+        try:
+            users = legacy_load(path) if legacy else store.all()
+            reads += 1
+            empty += not users
+        except Exception:
+            errors += 1
+    results.put(("reader", (reads, empty, errors)))
+
+
+def main(writers, ops, readers, legacy):
+    folder = tempfile.mkdtemp()
+    path = os.path.join(folder, "users.json")
+    UserStore(path).save([{"user_id": "counter", "pin": "", "permissions": [], "info": {"count": 0}}])
+
+    results, stop = mp.Queue(), mp.Event()
+    reader_procs = [mp.Process(target=reader, args=(path, stop, legacy, results)) for _ in range(readers)]
+    writer_procs = [mp.Process(target=writer, args=(path, n, ops, legacy, results)) for n in range(writers)]
+    started = time.perf_counter()
+    for p in reader_procs + writer_procs:
+        p.start()
+    for p in writer_procs:
+        p.join()
+    elapsed = time.perf_counter() - started
+    stop.set()
+    for p in reader_procs:
+        p.join()
+
+    conflicts, reads, empty_reads, read_errors = 0, 0, 0, 0
+    for _ in range(writers + readers):
+        kind, value = results.get()
+        if kind == "writer":
+            conflicts += value
+        else:
+            reads += value[0]
+            empty_reads += value[1]
+            read_errors += value[2]
+
+    with open(path, encoding="utf-8") as f:
+        users = json.load(f)
+    shutil.rmtree(folder)
+
+    expected = writers * ops
+    added = sum(1 for u in users if u["user_id"] != "counter")
+    counter = next((u["info"].get("count", 0) for u in users if u["user_id"] == "counter"), 0)
+    print(f"{'legacy' if legacy else 'locked'}: {writers} writers x {ops} ops in {elapsed:.2f}s "
+          f"({2 * expected / elapsed:.0f} writes/s), {conflicts} version conflicts retried")
+    print(f"  users added:   {added}/{expected}")
+    print(f"  counter:       {counter}/{expected}")
+    print(f"  reads:         {reads}, empty: {empty_reads}, errors: {read_errors}")
+    ok = added == expected and counter == expected and empty_reads == 0 and read_errors == 0
+    print("  OK" if ok else "  LOST UPDATES / BAD READS")
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stress users.json with concurrent writers")
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--ops", type=int, default=50)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--legacy", action="store_true", help="use the old unlocked save as a baseline")
+    args = parser.parse_args()
+    sys.exit(0 if main(args.writers, args.ops, args.readers, args.legacy) else 1)
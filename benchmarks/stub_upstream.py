@@ -0,0 +1,196 @@
+# benchmarks/stub_upstream.py
+# ✅ Local stand-in for the teletalk (getinvoice.php / getpass.php) and DGHS result pages.
+# Answers are derived from the submitted values, so the same roster always gets the same results;
+# latency, transient errors (503) and the "not found" share are configurable. Pages can also pull in
+# stylesheets / images / fonts (--assets) and show the form again above each answer (--form-on-result),
+# like the real sites, for the browser benchmarks.
+#
+# Run:   python benchmarks/stub_upstream.py --port 8765 --latency 0.2 --jitter 0.1 --error-rate 0.02
+# Then:  TELETALK_BASE_URL=http://127.0.0.1:8765 DGHS_BASE_URL=http://127.0.0.1:8765 python app.py
+
+import time
+import random
+import argparse
+import hashlib
+import threading
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+INVOICE_FORM = """<html><head>{assets}</head><body>
+<form name="form1" method="post" action="getinvoice.php">
+  <input type="text" id="sname" name="sname">
+  <input type="text" id="sfather" name="sfather">
+  <input type="text" id="smobile" name="smobile">
+  <input type="submit" id="button01" name="button01" value="Submit">
+</form>
+</body></html>"""
+
+PASS_FORM = """<html><head>{assets}</head><body>
+<form name="form1" method="post" action="getpass.php">
+  <input type="hidden" name="token" value="stub">
+  <input type="text" id="inv" name="inv">
+  <input type="text" id="smobile" name="smobile">
+  <input type="submit" id="button01" name="button01" value="Submit">
+</form>
+</body></html>"""
+
+RESULT_FORM = """<html><head>{assets}</head><body>
+<form method="post" action="">
+  <input type="text" id="roll2" name="roll2">
+  <button type="submit" class="search_btn" name="search" value="1">Search</button>
+</form>
+</body></html>"""
+
+ASSET_TYPES = {"css": "text/css", "png": "image/png", "woff2": "font/woff2"}
+
+
+def _asset_tags(count):
+    tags = []
+    for i in range(count):
+        kind = tuple(ASSET_TYPES)[i % len(ASSET_TYPES)]
+        if kind == "css":
+            tags.append(f'<link rel="stylesheet" href="/assets/{i}.css">')
+        elif kind == "png":
+            tags.append(f'<img src="/assets/{i}.png" alt="">')
+        else:
+            tags.append(f'<link rel="preload" as="font" type="font/woff2" crossorigin href="/assets/{i}.woff2">')
+    return "".join(tags)
+
+
+def _digest(*parts):
+    return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+
+
+def _letters(digest, count):
+    return "".join(chr(ord("A") + int(digest[i:i + 2], 16) % 26) for i in range(0, count * 2, 2))
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    latency = 0.0          # seconds added to every response
+    jitter = 0.0           # +/- uniform spread around `latency`
+    error_rate = 0.0       # share of form posts answered with 503
+    not_found_rate = 0.2   # share of keys that have no answer (decided by the key, not by chance)
+    assets = 0             # stylesheets / images / fonts referenced by every page
+    asset_latency = 0.0    # seconds to serve each of them
+    asset_size = 20000     # bytes per asset
+    form_on_result = False  # answer pages repeat the form (same URL), like the real sites
+    rng = random.Random(0)
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path.startswith("/assets/"):
+            time.sleep(self.asset_latency)
+            kind = path.rsplit(".", 1)[-1]
+            return self._send("x" * self.asset_size, content_type=ASSET_TYPES.get(kind, "application/octet-stream"))
+        self._delay()
+        page = self._form_page(path)
+        if page:
+            return self._send(page)
+        self._send("Not found", status=404)
+
+    def _form_page(self, path):
+        if path.endswith("/options/getinvoice.php"):
+            page = INVOICE_FORM
+        elif path.endswith("/options/getpass.php"):
+            page = PASS_FORM
+        elif path.rstrip("/").count("/") == 1:
+            page = RESULT_FORM
+        else:
+            return None
+        return page.format(assets=_asset_tags(self.assets))
+
+    # Answer page: the form again on top when form_on_result is set
+    def _answer(self, path, body):
+        page = self._form_page(path) if self.form_on_result else None
+        if page:
+            return self._send(page.replace("</body>", f"{body}</body>"))
+        self._send(f"<html><body>{body}</body></html>")
+
+    def do_POST(self):
+        path = urlparse(self.path).path
+        length = int(self.headers.get("Content-Length") or 0)
+        form = {k: v[0] for k, v in parse_qs(self.rfile.read(length).decode("utf-8")).items()}
+        self._delay()
+        if self.error_rate and self.rng.random() < self.error_rate:
+            return self._send("Service Unavailable", status=503)
+
+        if path.endswith("/options/getinvoice.php"):
+            digest = _digest(form.get("sname", ""), form.get("sfather", ""), form.get("smobile", ""))
+            if self._missing(digest):
+                body = '<span class="red12bold">Sorry, User ID not found!!</span>'
+            else:
+                body = f'<span class="red12bold">{_letters(digest, 10)}</span>'
+            return self._answer(path, body)
+
+        if path.endswith("/options/getpass.php"):
+            digest = _digest(form.get("inv", ""), form.get("smobile", ""))
+            answer = "Sorry, User ID not found!!" if self._missing(digest) else _letters(digest, 10)
+            return self._answer(path, '<span class="red12bold">Password</span>'
+                                      f'<span class="red12bold"> {answer} </span>')
+
+        roll = form.get("roll2", "")
+        digest = _digest(roll)
+        if self._missing(digest):
+            return self._answer(path, "<p>No result</p>")
+        cells = [roll, f"Student {roll}", str(int(digest[:2], 16) % 100), str(int(digest[2:4], 16) % 100),
+                 str(int(digest[4:8], 16) % 5000), f"C{int(digest[8:10], 16) % 40:02d}", "Selected"]
+        rows = "".join(f'<tr><td class="stones">{escape(c)}</td></tr>' for c in cells)
+        self._answer(path, f"<table>{rows}</table>")
+
+    def _missing(self, digest):
+        return int(digest[-4:], 16) / 0x10000 < self.not_found_rate
+
+    def _delay(self):
+        if self.latency or self.jitter:
+            time.sleep(max(0.0, self.latency + self.rng.uniform(-self.jitter, self.jitter)))
+
+    def _send(self, body, status=200, content_type="text/html; charset=utf-8"):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def make_handler(latency=0.0, jitter=0.0, error_rate=0.0, not_found_rate=0.2, seed=0,
+                 assets=0, asset_latency=0.0, form_on_result=False):
+    return type("StubHandler", (StubHandler,), {
+        "latency": latency, "jitter": jitter, "error_rate": error_rate,
+        "not_found_rate": not_found_rate, "rng": random.Random(seed),
+        "assets": assets, "asset_latency": asset_latency, "form_on_result": form_on_result,
+    })
+
+
+# ✅ Start the stub on a background thread; returns (server, base_url).
+# Keyword arguments are make_handler()'s; the running stub can be retuned through server.RequestHandlerClass.
+def start_stub(host="127.0.0.1", port=0, **settings):
+    server = ThreadingHTTPServer((host, port), make_handler(**settings))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local stub of the teletalk/DGHS lookup pages")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="+/- seconds around --latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of posts answered with 503")
+    parser.add_argument("--not-found-rate", type=float, default=0.2, help="share of keys without an answer")
+    parser.add_argument("--assets", type=int, default=0, help="stylesheets / images / fonts per page")
+    parser.add_argument("--asset-latency", type=float, default=0.0, help="seconds to serve each asset")
+    parser.add_argument("--form-on-result", action="store_true", help="answer pages repeat the form")
+    args = parser.parse_args()
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(
+        args.latency, args.jitter, args.error_rate, args.not_found_rate,
+        assets=args.assets, asset_latency=args.asset_latency, form_on_result=args.form_on_result))
+    print(f"Stub upstream on http://{args.host}:{args.port}")
+    server.serve_forever()
@@ -1,21 +1,23 @@
 from .auth import auth_bp
 from .dashboard import dashboard_bp
-from .mbbs_result import mbbs_result_bp
-from .bds_result import bds_result_bp
-from .mbbs_pass_recover import mbbs_pass_recover_bp
-from .bds_pass_recover import bds_pass_recover_bp
-from .mbbs_user_id import mbbs_user_id_bp
-from .bds_user_id import bds_user_id_bp
+from .lookup_definitions import LOOKUP_JOBS
+from .lookup_jobs import lookup_blueprint
 from .management import management_bp
+from .jobs import jobs_bp
+from .metrics import metrics_bp
+from .engines import LOOKUP_PRELOAD, preload
+
+# ✅ mbbs_result, bds_result, mbbs/bds_pass_recover, mbbs/bds_user_id (see lookup_definitions.py)
+lookup_bps = [lookup_blueprint(definition) for definition in LOOKUP_JOBS]
 
 def register_blueprints(app):
     app.register_blueprint(auth_bp)
     app.register_blueprint(dashboard_bp)
-    app.register_blueprint(mbbs_result_bp)
-    app.register_blueprint(bds_result_bp)
-    app.register_blueprint(mbbs_pass_recover_bp)
-    app.register_blueprint(bds_pass_recover_bp)
-    app.register_blueprint(mbbs_user_id_bp)
-    app.register_blueprint(bds_user_id_bp)
+    for bp in lookup_bps:
+        app.register_blueprint(bp)
     app.register_blueprint(management_bp)
+    app.register_blueprint(jobs_bp)
+    app.register_blueprint(metrics_bp)
+    if LOOKUP_PRELOAD:
+        preload()
 
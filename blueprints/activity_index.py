@@ -0,0 +1,221 @@
+# blueprints/activity_index.py
+# ✅ SQLite index over the activity log, for paged and filtered views of the log:
+#    newest first, keyset cursors on the insertion order, filters by user / action type / time range
+
+import os
+import json
+import sqlite3
+import threading
+from datetime import datetime, timezone
+
+from .activity_log import activity_log, action_type
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+INDEX_PATH = os.environ.get("ACTIVITY_INDEX_PATH", os.path.join(BASE_DIR, "..", "activity_index.sqlite3"))
+
+PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+EXPORT_BATCH = 1000
+
+COLUMNS = ("seq", "id", "ts", "user", "action", "type")
+
+_local = threading.local()
+
+
+def _entry_user(entry):
+    # Very old entries stored the whole user dict
+    user = entry.get("user")
+    return user.get("user_id") if isinstance(user, dict) else user
+
+
+def _row(entry):
+    return (entry.get("id"), entry.get("ts"), _entry_user(entry), entry.get("action"),
+            entry.get("type") or action_type(entry.get("action")))
+
+
+def _parse_lines(data):
+    rows = []
+    for line in data.splitlines():
+        try:
+            rows.append(_row(json.loads(line)))
+        except (json.JSONDecodeError, AttributeError):
+            continue  # torn or foreign line
+    return rows
+
+
+class ActivityIndex:
+    def __init__(self, log, path=INDEX_PATH):
+        self.log = log
+        self.path = path
+        log.watchers.append(self)
+
+    def _conn(self):
+        connections = getattr(_local, "connections", None)
+        if connections is None:
+            connections = _local.connections = {}
+        if self.path not in connections:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " seq INTEGER PRIMARY KEY AUTOINCREMENT,"
+                " id TEXT, ts TEXT, user TEXT, action TEXT, type TEXT);"
+                "CREATE INDEX IF NOT EXISTS entries_user ON entries (user, seq);"
+                "CREATE INDEX IF NOT EXISTS entries_type ON entries (type, seq);"
+                "CREATE INDEX IF NOT EXISTS entries_ts ON entries (ts);"
+                "CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value TEXT);"
+            )
+            connections[self.path] = conn
+        return connections[self.path]
+
+    def _state(self, conn):
+        return {r["key"]: r["value"] for r in conn.execute("SELECT key, value FROM state")}
+
+    def _save_state(self, conn, inode, offset):
+        conn.executemany("INSERT OR REPLACE INTO state (key, value) VALUES (?, ?)",
+                         [("inode", str(inode)), ("offset", str(offset))])
+
+    def _insert(self, conn, rows):
+        conn.executemany("INSERT INTO entries (id, ts, user, action, type) VALUES (?, ?, ?, ?, ?)", rows)
+
+    # 🔄 Index whatever was appended to the live file since the last sync (called under the log lock).
+    # The offset is read and advanced in one write transaction, so two workers never index the same bytes.
+    def sync(self):
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        with conn:
+            try:
+                st = os.stat(self.log.path)
+            except FileNotFoundError:
+                return
+            state = self._state(conn)
+            if state.get("inode") == "rotated":
+                offset = 0  # rotated() already indexed the old file; this one is new
+            elif state.get("inode") == str(st.st_ino) and int(state.get("offset", 0)) <= st.st_size:
+                offset = int(state["offset"])
+            else:
+                # First run, migration rewrote the file, or it was edited by hand: start over
+                self._reindex(conn)
+                return
+            with open(self.log.path, "rb") as f:
+                f.seek(offset)
+                data = f.read()
+            complete = data.rfind(b"\n") + 1  # leave a half-written last line for next time
+            self._insert(conn, _parse_lines(data[:complete].decode("utf-8")))
+            self._save_state(conn, st.st_ino, offset + complete)
+
+    def rotated(self):
+        conn = self._conn()
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO state (key, value) VALUES ('inode', 'rotated')")
+
+    def rebuild(self):
+        conn = self._conn()
+        with self.log._lock:
+            conn.execute("BEGIN IMMEDIATE")
+            with conn:
+                self._reindex(conn)
+
+    # Inside the caller's write transaction, under the log lock
+    def _reindex(self, conn):
+        conn.execute("DELETE FROM entries")
+        batch = []
+        for entry in self.log.read_all():
+            batch.append(_row(entry))
+            if len(batch) >= EXPORT_BATCH:
+                self._insert(conn, batch)
+                batch = []
+        self._insert(conn, batch)
+        try:
+            st = os.stat(self.log.path)
+            self._save_state(conn, st.st_ino, st.st_size)
+        except FileNotFoundError:
+            self._save_state(conn, "rotated", 0)
+
+    # Flush buffered entries and catch up before answering a query
+    def refresh(self):
+        with self.log._lock:
+            self.log.migrate()
+            self.log.flush()
+            self.sync()
+
+    @staticmethod
+    def _where(user=None, kind=None, since=None, until=None):
+        where, args = [], []
+        if user:
+            where.append("user = ?")
+            args.append(user)
+        if kind:
+            where.append("type = ?")
+            args.append(kind)
+        if since:
+            where.append("ts >= ?")
+            args.append(since)
+        if until:
+            where.append("ts <= ?")
+            args.append(until)
+        return where, args
+
+    # 📄 One page, newest first. `before` / `after` are seq cursors from a previous page.
+    # Returns {"entries": [...], "older": cursor or None, "newer": cursor or None}
+    def page(self, user=None, kind=None, since=None, until=None, before=None, after=None, limit=PAGE_SIZE):
+        self.refresh()
+        limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+        where, args = self._where(user, kind, since, until)
+        if after is not None:
+            where.append("seq > ?")
+            args.append(after)
+            order = "ASC"
+        else:
+            if before is not None:
+                where.append("seq < ?")
+                args.append(before)
+            order = "DESC"
+        sql = f"SELECT {', '.join(COLUMNS)} FROM entries"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" ORDER BY seq {order} LIMIT ?"
+        rows = [dict(r) for r in self._conn().execute(sql, args + [limit + 1])]
+        more = len(rows) > limit
+        rows = rows[:limit]
+
+        if after is not None:
+            rows.reverse()
+            newer = rows[0]["seq"] if more and rows else None
+            older = rows[-1]["seq"] if rows else after + 1
+        else:
+            older = rows[-1]["seq"] if more else None
+            newer = rows[0]["seq"] if before is not None and rows else None
+            if before is not None and not rows:
+                newer = before - 1
+        return {"entries": rows, "older": older, "newer": newer}
+
+    # ⬇ Every matching entry, oldest first, read in keyset batches (never the whole range at once)
+    def iter_entries(self, user=None, kind=None, since=None, until=None):
+        self.refresh()
+        where, args = self._where(user, kind, since, until)
+        last = 0
+        while True:
+            sql = (f"SELECT {', '.join(COLUMNS)} FROM entries WHERE "
+                   + " AND ".join(where + ["seq > ?"]) + " ORDER BY seq LIMIT ?")
+            rows = self._conn().execute(sql, args + [last, EXPORT_BATCH]).fetchall()
+            if not rows:
+                return
+            for r in rows:
+                yield dict(r)
+            last = rows[-1]["seq"]
+
+
+activity_index = ActivityIndex(activity_log)
+
+
+# 🕒 "2024-05-01T10:30" (datetime-local) or any ISO time -> the UTC form stored in `ts`; ValueError if unreadable
+def parse_time(value):
+    if not value:
+        return None
+    moment = datetime.fromisoformat(value.strip())
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc).isoformat(timespec="seconds")
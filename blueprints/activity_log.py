@@ -0,0 +1,184 @@
+# blueprints/activity_log.py
+# ✅ Append-only activity log (JSON Lines): timestamped entries, buffered writes,
+#    size-based rotation into gzip files, one-time import of the old activity_logs.json array
+
+import os
+import gzip
+import json
+import uuid
+import time
+import atexit
+import shutil
+import threading
+from datetime import datetime, timezone
+
+from .user_store import FileLock
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+LOG_FILE = os.environ.get("ACTIVITY_LOG_FILE", os.path.join(BASE_DIR, "..", "activity_logs.jsonl"))
+LEGACY_LOG_FILE = os.path.join(BASE_DIR, "..", "activity_logs.json")
+
+LOG_MAX_BYTES = int(os.environ.get("ACTIVITY_LOG_MAX_BYTES", str(5 * 1024 * 1024)))
+LOG_BACKUPS = int(os.environ.get("ACTIVITY_LOG_BACKUPS", "10"))
+LOG_BUFFER_SIZE = int(os.environ.get("ACTIVITY_LOG_BUFFER", "50"))
+LOG_FLUSH_SECONDS = float(os.environ.get("ACTIVITY_LOG_FLUSH_SECONDS", "2"))
+
+
+# 🏷️ Action type per message prefix, used to filter the log viewer
+ACTION_TYPES = {
+    "add_member": "Added new member",
+    "update_permissions": "Updated permissions",
+    "edit_info": "Edited info",
+}
+
+
+def now_iso():
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def action_type(action):
+    for kind, prefix in ACTION_TYPES.items():
+        if str(action or "").startswith(prefix):
+            return kind
+    return "other"
+
+
+class ActivityLog:
+    def __init__(self, path=LOG_FILE, legacy_path=LEGACY_LOG_FILE, max_bytes=LOG_MAX_BYTES,
+                 backups=LOG_BACKUPS, buffer_size=LOG_BUFFER_SIZE, flush_seconds=LOG_FLUSH_SECONDS):
+        self.path = path
+        self.legacy_path = legacy_path
+        # Every worker appends to the same file: migrate, flush and rotate hold this lock across processes
+        self.lock_path = path + ".lock"
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.buffer_size = max(1, buffer_size)
+        self.flush_seconds = flush_seconds
+        self._buffer = []
+        self._lock = threading.RLock()
+        self._flusher = None
+        self._migrated = False
+        # Objects with sync() / rotated(), told about every write and rotation (see activity_index.py)
+        self.watchers = []
+
+    # 📝 Queue one entry; written with the next batch (buffer full, or every flush_seconds)
+    def log(self, user, action):
+        entry = {"id": str(uuid.uuid4()), "ts": now_iso(), "user": user, "action": action, "type": action_type(action)}
+        with self._lock:
+            self._buffer.append(entry)
+            if len(self._buffer) >= self.buffer_size:
+                self.flush()
+            elif self._flusher is None:
+                self._flusher = threading.Thread(target=self._flush_loop, daemon=True)
+                self._flusher.start()
+        return entry
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(self.flush_seconds)
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            if not self._buffer:
+                return
+            with FileLock(self.lock_path):
+                self._migrate()
+                lines = "".join(json.dumps(e, ensure_ascii=False) + "\n" for e in self._buffer)
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(lines)
+                self._buffer = []
+                for watcher in self.watchers:
+                    watcher.sync()
+                if os.path.getsize(self.path) >= self.max_bytes:
+                    self._rotate()
+
+    def _backup_path(self, n):
+        return f"{self.path}.{n}.gz"
+
+    # 🔄 activity_logs.jsonl -> .1.gz, .1.gz -> .2.gz, ... keeping `backups` files
+    def rotate(self):
+        with self._lock, FileLock(self.lock_path):
+            self._rotate()
+
+    def _rotate(self):
+        if not os.path.exists(self.path):
+            return
+        oldest = self._backup_path(self.backups)
+        if os.path.exists(oldest):
+            os.remove(oldest)
+        for n in range(self.backups - 1, 0, -1):
+            if os.path.exists(self._backup_path(n)):
+                os.replace(self._backup_path(n), self._backup_path(n + 1))
+        tmp_path = self._backup_path(1) + ".tmp"
+        with open(self.path, "rb") as src, gzip.open(tmp_path, "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        os.replace(tmp_path, self._backup_path(1))
+        os.remove(self.path)
+        for watcher in self.watchers:
+            watcher.rotated()
+
+    # 📦 One-time import of the old JSON array; the array file is kept as *.migrated
+    def migrate(self):
+        with self._lock:
+            if self._migrated:
+                return
+            with FileLock(self.lock_path):
+                self._migrate()
+
+    # Under the file lock: another worker may have imported (and renamed) the array already
+    def _migrate(self):
+        if self._migrated:
+            return
+        self._migrated = True
+        if not os.path.exists(self.legacy_path):
+            return
+        with open(self.legacy_path, "r", encoding="utf-8") as f:
+            try:
+                legacy = json.load(f)
+            except json.JSONDecodeError:
+                return  # leave a damaged file alone rather than lose it
+        current = ""
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as f:
+                current = f.read()
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for entry in legacy:
+                f.write(json.dumps({"ts": None, **entry}, ensure_ascii=False) + "\n")
+            f.write(current)
+        os.replace(tmp_path, self.path)
+        os.replace(self.legacy_path, self.legacy_path + ".migrated")
+
+    # ✅ Every entry, oldest first: rotated archives, then the live file (pending entries are flushed first)
+    def entries(self):
+        self.migrate()
+        self.flush()
+        yield from self.read_all()
+
+    # Same as entries() without flushing; callers that need a stable view hold the lock
+    def read_all(self):
+        for n in range(self.backups, 0, -1):
+            path = self._backup_path(n)
+            if os.path.exists(path):
+                with gzip.open(path, "rt", encoding="utf-8") as f:
+                    yield from _read_lines(f)
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as f:
+                yield from _read_lines(f)
+
+
+def _read_lines(f):
+    for line in f:
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError:
+            continue  # torn line from a crash mid-write
+
+
+activity_log = ActivityLog()
+atexit.register(activity_log.flush)
+
+
+def log_activity(user_id, action):
+    return activity_log.log(user_id, action)
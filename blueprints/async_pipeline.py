@@ -0,0 +1,184 @@
+# blueprints/async_pipeline.py
+# ✅ asyncio lookup pipeline: pooled aiohttp client, bounded concurrency, per-host rate limits
+
+import os
+import time
+import asyncio
+import threading
+from queue import Queue
+from contextlib import asynccontextmanager
+from urllib.parse import urljoin, urlparse
+
+import aiohttp
+
+from .engines import EngineError, HTTP_TIMEOUT, build_form_data, capped, parse_form
+
+ASYNC_CONCURRENCY = int(os.environ.get("ASYNC_CONCURRENCY", "20"))
+ASYNC_POOL_SIZE = int(os.environ.get("ASYNC_POOL_SIZE", "32"))
+
+# ⚙️ Requests per second allowed against each upstream host (0 = unlimited)
+HOST_RATE_LIMITS = {
+    "dgme.teletalk.com.bd": float(os.environ.get("RATE_LIMIT_TELETALK", "10")),
+    "result.dghs.gov.bd": float(os.environ.get("RATE_LIMIT_DGHS", "10")),
+}
+DEFAULT_RATE_LIMIT = float(os.environ.get("RATE_LIMIT_DEFAULT", "0"))
+
+_END = object()
+
+
+# 🪣 Token bucket shared by every job (and event loop) talking to the same host
+class TokenBucket:
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.capacity = burst or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _take(self):
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0
+            return (1 - self.tokens) / self.rate
+
+    async def acquire(self):
+        while True:
+            wait = self._take()
+            if not wait:
+                return
+            await asyncio.sleep(wait)
+
+
+_buckets = {}
+_buckets_lock = threading.Lock()
+
+
+def bucket_for(url):
+    host = urlparse(url).hostname or ""
+    rate = HOST_RATE_LIMITS.get(host, DEFAULT_RATE_LIMIT)
+    if rate <= 0:
+        return None
+    with _buckets_lock:
+        if host not in _buckets:
+            _buckets[host] = TokenBucket(rate)
+        return _buckets[host]
+
+
+# ✅ Async twin of engines.HttpEngine; one instance per job / event loop
+class AsyncHttpEngine:
+    name = "async"
+    is_async = True
+
+    def __init__(self, fallback=None, timeout=HTTP_TIMEOUT):
+        self.fallback = fallback
+        self.limit = timeout
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.session = None
+        self._forms = {}
+        self._form_locks = {}
+
+    @asynccontextmanager
+    async def open(self, pool_size=ASYNC_POOL_SIZE):
+        connector = aiohttp.TCPConnector(limit=pool_size, keepalive_timeout=30)
+        async with aiohttp.ClientSession(connector=connector, timeout=self.timeout) as session:
+            self.session = session
+            try:
+                yield self
+            finally:
+                self.session = None
+
+    async def lookup(self, form, form_url, *args, timeout=None):
+        try:
+            html = await self.submit(form_url, form.values(args), form.submit_id, form.submit_class, timeout)
+            return form.pick(html)
+        except EngineError as e:
+            return await self._fall_back(e, "lookup", form, form_url, *args, timeout=timeout)
+
+    async def submit(self, form_url, values, submit_id=None, submit_class=None, timeout=None):
+        form = await self.form_for(form_url, next(iter(values)))
+        data = build_form_data(form, values, submit_id, submit_class)
+        target = urljoin(form_url, form["action"] or form_url)
+        timeout = aiohttp.ClientTimeout(total=capped(timeout, self.limit))
+        if form["method"] == "post":
+            return await self._fetch("POST", target, data=data, timeout=timeout)
+        return await self._fetch("GET", target, params=data, timeout=timeout)
+
+    async def form_for(self, form_url, field_id):
+        lock = self._form_locks.setdefault(form_url, asyncio.Lock())
+        async with lock:
+            if form_url not in self._forms:
+                self._forms[form_url] = parse_form(await self._fetch("GET", form_url), field_id, form_url)
+        return self._forms[form_url]
+
+    async def _fetch(self, method, url, **kwargs):
+        bucket = bucket_for(url)
+        if bucket:
+            await bucket.acquire()
+        try:
+            async with self.session.request(method, url, **kwargs) as response:
+                response.raise_for_status()
+                return await response.text()
+        except aiohttp.ClientConnectionError as e:
+            # Dropped / refused connections, as the builtin type engines.is_transient knows
+            raise ConnectionError(str(e) or type(e).__name__) from e
+
+    async def _fall_back(self, error, method, *args, **kwargs):
+        if self.fallback is None:
+            raise error
+        return await asyncio.to_thread(getattr(self.fallback, method), *args, **kwargs)
+
+
+# ✅ Same contract as parallel.run_parallel: yields (key, result) as lookups complete.
+# The event loop runs on its own thread; the streaming generator just drains a queue.
+def run_async(items, handler, engine, concurrency=None):
+    concurrency = max(1, concurrency or ASYNC_CONCURRENCY)
+    done = Queue()
+    stop = threading.Event()
+
+    async def one(key, item, semaphore):
+        try:
+            done.put((key, await handler(item), None))
+        except Exception as e:
+            done.put((key, None, e))
+        finally:
+            semaphore.release()
+
+    async def main():
+        semaphore = asyncio.Semaphore(concurrency)
+        async with engine.open(max(concurrency, ASYNC_POOL_SIZE)):
+            tasks = set()
+            for key, item in items:
+                if stop.is_set():
+                    break
+                await semaphore.acquire()
+                task = asyncio.create_task(one(key, item, semaphore))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+
+    def runner():
+        try:
+            asyncio.run(main())
+        except Exception as e:
+            done.put((None, None, e))
+        finally:
+            done.put(_END)
+
+    threading.Thread(target=runner, daemon=True).start()
+
+    try:
+        while True:
+            message = done.get()
+            if message is _END:
+                break
+            key, result, error = message
+            if error is not None:
+                raise error
+            yield key, result
+    finally:
+        stop.set()
@@ -1,11 +1,7 @@
 from flask import Blueprint, render_template, session, redirect, url_for, request
-from .mbbs_user_id import get_mbbs_ids
-from .bds_user_id import get_bds_ids
-from .mbbs_pass_recover import get_mbbs_pass
-from .bds_pass_recover import get_bds_pass
-from .mbbs_result import get_mbbs_results
-from .bds_result import get_bds_results
-from .management import load_users
+from .user_store import load_users
+from .jobs import list_jobs, scheduler
+from .management import render_activity_logs
 
 dashboard_bp = Blueprint("dashboard", __name__)
 
@@ -46,27 +42,15 @@ def content_page(page):
 
     try:
         match page:
-            case "mbbs_user_id":
-                return render_template("pages/mbbs_user_id.html", ids=get_mbbs_ids())
-
-            case "bds_user_id":
-                return render_template("pages/bds_user_id.html", ids=get_bds_ids())
-
-            case "mbbs_pass_recover":
-                return render_template("pages/mbbs_pass_recover.html", ids=get_mbbs_pass())
-
-            case "bds_pass_recover":
-                return render_template("pages/bds_pass_recover.html", ids=get_bds_pass())
-
-            case "mbbs_result":
-                return render_template("pages/mbbs_result.html", results=get_mbbs_results())
-
-            case "bds_result":
-                return render_template("pages/bds_result.html", results=get_bds_results())
-
             case "management":
                 return render_template("pages/management.html", members=load_users())
 
+            case "activity_logs":
+                return render_activity_logs(request.args)
+
+            case "jobs":
+                return render_template("pages/jobs.html", jobs=list_jobs(), queue=scheduler.stats())
+
             # Static page loader fallback
             case _:
                 return render_template(f"pages/{page}.html")
@@ -0,0 +1,317 @@
+# blueprints/driver_pool.py
+# ✅ Shared, bounded pool of headless Chrome drivers used by every lookup blueprint
+
+import os
+import json
+import shutil
+import atexit
+import threading
+import subprocess
+from contextlib import contextmanager
+from queue import Queue, Empty
+
+from .metrics import Counter, Gauge, health_check
+
+# ⚙️ Deployment settings (environment variables)
+DRIVER_POOL_SIZE = int(os.environ.get("DRIVER_POOL_SIZE", "2"))
+DRIVER_POOL_WARM = int(os.environ.get("DRIVER_POOL_WARM", "0"))
+DRIVER_MAX_PAGES = int(os.environ.get("DRIVER_MAX_PAGES", "200"))
+DRIVER_CHECKOUT_TIMEOUT = float(os.environ.get("DRIVER_CHECKOUT_TIMEOUT", "300"))
+
+# 🧭 chromedriver: an explicit binary, or resolved once and remembered in CHROMEDRIVER_CACHE.
+# CHROMEDRIVER_OFFLINE=1 never downloads (air-gapped hosts); CHROMEDRIVER_VERSION pins the download.
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CHROMEDRIVER_PATH = os.environ.get("CHROMEDRIVER_PATH", "")
+CHROMEDRIVER_VERSION = os.environ.get("CHROMEDRIVER_VERSION", "")
+CHROMEDRIVER_OFFLINE = os.environ.get("CHROMEDRIVER_OFFLINE", "0") == "1"
+CHROMEDRIVER_CACHE = os.environ.get("CHROMEDRIVER_CACHE", os.path.join(BASE_DIR, "..", "chromedriver.json"))
+CHROME_BINARY = os.environ.get("CHROME_BINARY", "")
+
+# 🪶 BROWSER_PROFILE=lean (default): eager page loads, no images / stylesheets / fonts, no extensions or
+# background traffic, and the engine refills a form already on screen instead of reloading it.
+# BROWSER_PROFILE=default keeps stock Chrome behaviour.
+LEAN_BROWSER = os.environ.get("BROWSER_PROFILE", "lean").lower() == "lean"
+BLOCKED_RESOURCES = (
+    "*.css", "*.png", "*.jpg", "*.jpeg", "*.gif", "*.svg", "*.webp", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+)
+LEAN_ARGUMENTS = (
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-features=Translate,OptimizationHints,MediaRouter",
+    "--no-first-run",
+    "--mute-audio",
+    "--blink-settings=imagesEnabled=false",
+)
+
+
+class DriverUnavailable(RuntimeError):
+    """No usable chromedriver binary (offline mode with nothing provided locally)."""
+
+
+_chromedriver = None
+_chromedriver_error = None
+_chromedriver_lock = threading.Lock()
+
+
+# Version reported by the binary itself ("ChromeDriver 126.0.6478.126 (...)")
+def _binary_version(path):
+    try:
+        output = subprocess.run([path, "--version"], capture_output=True, text=True, timeout=10).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    parts = output.split()
+    return parts[1] if len(parts) > 1 else None
+
+
+def _cached_chromedriver():
+    try:
+        with open(CHROMEDRIVER_CACHE, encoding="utf-8") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not os.path.isfile(cached.get("path", "")):
+        return None
+    if CHROMEDRIVER_VERSION and not (cached.get("version") or "").startswith(CHROMEDRIVER_VERSION):
+        return None
+    return dict(cached, source="cache")
+
+
+def _resolve_chromedriver():
+    if CHROMEDRIVER_PATH:
+        if not os.path.isfile(CHROMEDRIVER_PATH):
+            raise DriverUnavailable(f"CHROMEDRIVER_PATH does not exist: {CHROMEDRIVER_PATH}")
+        return {"path": CHROMEDRIVER_PATH, "version": _binary_version(CHROMEDRIVER_PATH), "source": "env"}
+
+    cached = _cached_chromedriver()
+    if cached:
+        return cached
+
+    if CHROMEDRIVER_OFFLINE:
+        path = shutil.which("chromedriver")
+        if not path:
+            raise DriverUnavailable("Offline mode: set CHROMEDRIVER_PATH or put chromedriver on PATH")
+        return {"path": path, "version": _binary_version(path), "source": "path"}
+
+    from webdriver_manager.chrome import ChromeDriverManager
+    path = ChromeDriverManager(driver_version=CHROMEDRIVER_VERSION or None).install()
+    resolved = {"path": path, "version": _binary_version(path), "source": "download"}
+    try:
+        with open(CHROMEDRIVER_CACHE, "w", encoding="utf-8") as f:
+            json.dump({"path": path, "version": resolved["version"]}, f)
+    except OSError:
+        pass
+    return resolved
+
+
+# ✅ Resolved once per process (LOOKUP_PRELOAD does it at startup), then reused for every browser
+def chromedriver():
+    global _chromedriver, _chromedriver_error
+    with _chromedriver_lock:
+        if _chromedriver is None:
+            try:
+                _chromedriver = _resolve_chromedriver()
+            except Exception as e:
+                _chromedriver_error = str(e)
+                raise
+            _chromedriver_error = None
+        return _chromedriver
+
+
+# For /health: what has been resolved so far, without resolving (which may download)
+def chromedriver_info():
+    resolved = _chromedriver
+    if resolved is None:
+        return {"resolved": False, "offline": CHROMEDRIVER_OFFLINE, "error": _chromedriver_error}
+    return {"resolved": True, "offline": CHROMEDRIVER_OFFLINE, **resolved}
+
+
+# 💤 selenium / webdriver_manager load with the first browser, not with the app
+def build_options(page_load_strategy=None):
+    from selenium.webdriver.chrome.options import Options
+
+    options = Options()
+    if CHROME_BINARY:
+        options.binary_location = CHROME_BINARY
+    options.add_argument("--headless=new")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    if LEAN_BROWSER:
+        # Hand the page over once the DOM is parsed; the lookups only need the form
+        options.page_load_strategy = "eager"
+        for argument in LEAN_ARGUMENTS:
+            options.add_argument(argument)
+        options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+    if page_load_strategy:
+        options.page_load_strategy = page_load_strategy
+    return options
+
+
+def create_driver(page_load_strategy=None):
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+
+    driver = webdriver.Chrome(service=Service(chromedriver()["path"]), options=build_options(page_load_strategy))
+    if LEAN_BROWSER:
+        # Stylesheets and fonts have no content setting; block them (and images) at the network layer
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(BLOCKED_RESOURCES)})
+    return driver
+
+
+class DriverPool:
+    def __init__(self, size=DRIVER_POOL_SIZE, max_pages=DRIVER_MAX_PAGES, factory=create_driver):
+        self.size = max(1, size)
+        self.max_pages = max_pages
+        self.factory = factory
+        self._idle = Queue()
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._pages = {}
+        self._lock = threading.Lock()
+        self._created = 0
+        self._recycled = 0
+
+    # 🔥 Start idle drivers ahead of the first job
+    def warm(self, count):
+        count = min(count, self.size)
+        drivers = [self.checkout() for _ in range(count)]
+        for driver in drivers:
+            self.release(driver)
+
+    # 📤 Take a driver out of the pool (blocks while all slots are busy)
+    def checkout(self, timeout=DRIVER_CHECKOUT_TIMEOUT):
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError("No browser available in the driver pool")
+        try:
+            while True:
+                try:
+                    driver = self._idle.get_nowait()
+                except Empty:
+                    return self._start()
+                if self._is_alive(driver):
+                    return driver
+                self._discard(driver)
+        except Exception:
+            self._slots.release()
+            raise
+
+    # 📥 Return a driver; broken or worn-out drivers are replaced lazily
+    def release(self, driver, broken=False):
+        try:
+            with self._lock:
+                self._pages[id(driver)] = self._pages.get(id(driver), 0) + 1
+                worn_out = self.max_pages and self._pages[id(driver)] >= self.max_pages
+            if broken or worn_out or not self._is_alive(driver):
+                self._discard(driver)
+            else:
+                self._idle.put(driver)
+        finally:
+            self._slots.release()
+
+    # Page-level errors (timeouts, missing elements) keep the browser; a lost session retires it.
+    # Anything else that killed Chrome is caught by the liveness check in release().
+    @contextmanager
+    def driver(self):
+        from selenium.common.exceptions import InvalidSessionIdException
+
+        driver = self.checkout()
+        broken = False
+        try:
+            yield driver
+        except InvalidSessionIdException:
+            broken = True
+            raise
+        finally:
+            self.release(driver, broken=broken)
+
+    def stats(self):
+        with self._lock:
+            idle = self._idle.qsize()
+            return {
+                "size": self.size,
+                "idle": idle,
+                "in_use": max(0, len(self._pages) - idle),
+                "alive": len(self._pages),
+                "created": self._created,
+                "recycled": self._recycled,
+            }
+
+    def close(self):
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except Empty:
+                break
+            self._discard(driver)
+
+    def _start(self):
+        driver = self.factory()
+        with self._lock:
+            self._pages[id(driver)] = 0
+            self._created += 1
+        POOL_CREATED.inc()
+        return driver
+
+    def _discard(self, driver):
+        with self._lock:
+            if self._pages.pop(id(driver), None) is not None:
+                self._recycled += 1
+                POOL_RECYCLED.inc()
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    @staticmethod
+    def _is_alive(driver):
+        try:
+            driver.current_url
+            return True
+        except Exception:
+            return False
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+# Stats of the shared pool, or None while no browser lookup has created it
+def pool_stats():
+    pool = _pool
+    return pool.stats() if pool is not None else None
+
+
+# 📊 Utilization, read at scrape time
+def _pool_stat(name):
+    def collect():
+        stats = pool_stats()
+        return {(): stats[name]} if stats else {}
+    return collect
+
+
+Gauge("driver_pool_size", "Browsers the pool may run at once", collect=_pool_stat("size"))
+Gauge("driver_pool_in_use", "Browsers checked out by lookups", collect=_pool_stat("in_use"))
+Gauge("driver_pool_idle", "Started browsers waiting in the pool", collect=_pool_stat("idle"))
+POOL_CREATED = Counter("driver_pool_created_total", "Browsers started since the process began")
+POOL_RECYCLED = Counter("driver_pool_recycled_total", "Browsers quit (broken or worn out) since the process began")
+Gauge("chromedriver_info", "The chromedriver binary browsers are started with", ("version", "source"),
+      collect=lambda: {(_chromedriver["version"] or "", _chromedriver["source"]): 1} if _chromedriver else {})
+
+health_check("chromedriver", chromedriver_info)
+health_check("driver_pool", pool_stats)
+
+
+# ✅ Process-wide pool shared by all blueprints
+def get_driver_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = DriverPool()
+            atexit.register(_pool.close)
+            if DRIVER_POOL_WARM:
+                _pool.warm(DRIVER_POOL_WARM)
+        return _pool
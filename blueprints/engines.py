@@ -0,0 +1,394 @@
+# blueprints/engines.py
+# ✅ Pluggable lookup engines: Selenium (full browser) and direct HTTP form submission
+
+import os
+import sys
+import threading
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+
+# 💤 requests and selenium are imported by the engines that use them, so web workers that only
+# serve pages never load them (see benchmarks/bench_startup.py)
+from .driver_pool import LEAN_BROWSER, get_driver_pool
+from .metrics import Histogram
+
+# ⚙️ Upstream base URLs (point these at a local stub server for testing)
+TELETALK_BASE_URL = os.environ.get("TELETALK_BASE_URL", "http://dgme.teletalk.com.bd")
+DGHS_BASE_URL = os.environ.get("DGHS_BASE_URL", "https://result.dghs.gov.bd")
+
+LOOKUP_ENGINE = os.environ.get("LOOKUP_ENGINE", "selenium")
+ENGINES = ("selenium", "http", "async", "tabs")
+HTTP_POOL_SIZE = int(os.environ.get("HTTP_POOL_SIZE", "16"))
+HTTP_TIMEOUT = float(os.environ.get("HTTP_TIMEOUT", "10"))
+LOOKUP_PRELOAD = os.environ.get("LOOKUP_PRELOAD", "0") == "1"
+
+PAGE_LOAD_SECONDS = Histogram("browser_page_load_seconds", "Time for the browser to load a lookup form page")
+
+
+def user_id_form_url(exam):
+    return f"{TELETALK_BASE_URL}/{exam}/options/getinvoice.php"
+
+
+def pass_form_url(exam):
+    return f"{TELETALK_BASE_URL}/{exam}/options/getpass.php"
+
+
+def result_form_url(exam):
+    return f"{DGHS_BASE_URL}/{exam}/"
+
+
+class EngineError(Exception):
+    """The page did not have the form or result element the engine expected."""
+
+
+# 🌩️ Worth retrying: timeouts, dropped connections, browser hiccups, 5xx / 429 answers.
+# EngineError (page without the expected form or answer), 4xx answers and elements missing from a
+# loaded page will not improve on a retry.
+def is_transient(error):
+    status = getattr(getattr(error, "response", None), "status_code", None) or getattr(error, "status", None)
+    if isinstance(status, int):
+        return status >= 500 or status == 429
+    return isinstance(error, _transient_types()) and not isinstance(error, _page_errors())
+
+
+# Only from libraries already loaded: an error cannot come from one that was never imported
+def _transient_types():
+    types = [TimeoutError, ConnectionError]
+    if "requests" in sys.modules:
+        types.append(sys.modules["requests"].RequestException)
+    if "selenium.common.exceptions" in sys.modules:
+        types.append(sys.modules["selenium.common.exceptions"].WebDriverException)
+    return tuple(types)
+
+
+def _page_errors():
+    if "selenium.common.exceptions" not in sys.modules:
+        return ()
+    exceptions = sys.modules["selenium.common.exceptions"]
+    return (exceptions.NoSuchElementException, exceptions.StaleElementReferenceException,
+            exceptions.ElementNotInteractableException)
+
+
+# ⏱️ Adaptive timeout from the caller, never above the configured one
+def capped(timeout, limit):
+    return min(timeout, limit) if timeout else limit
+
+
+# 📝 One upstream form, as data: the input element ids (in lookup-argument order), the submit control,
+# and the elements carrying the answer. result_index None returns the text of every match as a list.
+class Form:
+    def __init__(self, fields, result_class, result_index=None, submit_id=None, submit_class=None,
+                 field_timeout=10, result_timeout=10):
+        self.fields = tuple(fields)
+        self.result_class = result_class
+        self.result_index = result_index
+        self.submit_id = submit_id
+        self.submit_class = submit_class
+        self.field_timeout = field_timeout
+        self.result_timeout = result_timeout
+
+    @property
+    def returns_list(self):
+        return self.result_index is None
+
+    def values(self, args):
+        return dict(zip(self.fields, args))
+
+    # Answer from a response page (HTTP engines)
+    def pick(self, html):
+        if self.returns_list:
+            return find_by_class(html, self.result_class)
+        return pick_by_class(html, self.result_class, self.result_index).strip()
+
+
+def _nth_by_class(css_class, index):
+    from selenium.webdriver.common.by import By
+
+    def present(driver):
+        elements = driver.find_elements(By.CLASS_NAME, css_class)
+        return elements[index] if len(elements) > index else False
+    return present
+
+
+# 📜 The answer page, once the submit has replaced the form's document: [readyState, texts of result_class]
+ANSWER_SCRIPT = """
+if (window.__lookupPending || document.readyState === "loading") return null;
+return [document.readyState, Array.from(document.getElementsByClassName(arguments[0]), el => el.innerText)];
+"""
+
+
+# A fully loaded answer page without any match is an empty list, as on the HTTP engine
+def _all_by_class(css_class):
+    def answered(driver):
+        answer = driver.execute_script(ANSWER_SCRIPT, css_class)
+        return answer if answer and (answer[1] or answer[0] == "complete") else False
+    return answered
+
+
+# ⏳ An element wait that runs out on a loaded page: the page answered without it, a retry won't help
+def _wait_for(wait, condition, missing):
+    from selenium.common.exceptions import TimeoutException
+
+    try:
+        return wait.until(condition)
+    except TimeoutException:
+        raise EngineError(missing) from None
+
+
+# 🔁 The previous submit navigated to a page of the same URL that shows the form again: fill that one in
+# instead of loading the form page. The marker is set just before each submit, so only a fresh document
+# (not the page still waiting on its answer) qualifies.
+_FORM_ON_PAGE = """
+return !window.__lookupPending && location.href === arguments[0] && !!document.getElementById(arguments[1]);
+"""
+
+
+def _navigated(driver):
+    return driver.execute_script("return !window.__lookupPending")
+
+
+# ✅ Selenium engine: drives a pooled headless Chrome
+class SeleniumEngine:
+    name = "selenium"
+
+    def lookup(self, form, form_url, *args, timeout=None):
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+
+        with get_driver_pool().driver() as driver:
+            values = list(form.values(args).items())
+            first_id = values[0][0]
+            in_page = LEAN_BROWSER and driver.execute_script(_FORM_ON_PAGE, form_url, first_id)
+            if not in_page:
+                with PAGE_LOAD_SECONDS.time():
+                    driver.get(form_url)
+            fields = [_wait_for(WebDriverWait(driver, capped(timeout, form.field_timeout)),
+                                EC.presence_of_element_located((By.ID, first_id)),
+                                f"No #{first_id} field on {form_url}")]
+            fields += [driver.find_element(By.ID, field_id) for field_id, _ in values[1:]]
+            for field, (_, value) in zip(fields, values):
+                if in_page:
+                    field.clear()
+                field.send_keys(value)
+            driver.execute_script("window.__lookupPending = true")
+            if form.submit_id:
+                driver.find_element(By.ID, form.submit_id).click()
+            else:
+                driver.find_element(By.CLASS_NAME, form.submit_class).click()
+
+            wait = WebDriverWait(driver, capped(timeout, form.result_timeout))
+            # The submitted page stays on screen until the answer replaces it; a slow answer is a timeout
+            wait.until(_navigated)
+            missing = f"No '{form.result_class}' answer on {form_url}"
+            if form.returns_list:
+                return _wait_for(wait, _all_by_class(form.result_class), missing)[1]
+            return _wait_for(wait, _nth_by_class(form.result_class, form.result_index), missing).text.strip()
+
+
+# 🧩 Collects every <form> with its action, method and named inputs
+class _FormParser(HTMLParser):
+    def __init__(self):
+        super().__init__()
+        self.forms = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "form":
+            self.forms.append({
+                "action": attrs.get("action") or "",
+                "method": (attrs.get("method") or "get").lower(),
+                "fields": [],
+            })
+        elif tag in ("input", "button", "select", "textarea") and self.forms:
+            self.forms[-1]["fields"].append({
+                "id": attrs.get("id"),
+                "name": attrs.get("name"),
+                "type": (attrs.get("type") or ("submit" if tag == "button" else "text")).lower(),
+                "value": attrs.get("value") or "",
+                "class": (attrs.get("class") or "").split(),
+            })
+
+
+# 🧩 Collects the text of every element carrying a CSS class
+class _ClassTextParser(HTMLParser):
+    VOID = {"br", "img", "input", "meta", "link", "hr", "col", "area", "base", "wbr", "source"}
+
+    def __init__(self, css_class):
+        super().__init__()
+        self.css_class = css_class
+        self.texts = []
+        self._open = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.VOID:
+            return
+        classes = (dict(attrs).get("class") or "").split()
+        if self.css_class in classes:
+            self.texts.append([])
+            self._open.append((tag, len(self.texts) - 1))
+        elif self._open:
+            self._open.append((tag, None))
+
+    def handle_endtag(self, tag):
+        while self._open:
+            open_tag, _ = self._open.pop()
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data):
+        for _, index in self._open:
+            if index is not None:
+                self.texts[index].append(data)
+
+    def results(self):
+        return [" ".join("".join(parts).split()) for parts in self.texts]
+
+
+def find_by_class(html, css_class):
+    parser = _ClassTextParser(css_class)
+    parser.feed(html)
+    parser.close()
+    return parser.results()
+
+
+# ✅ HTTP engine: submits the forms over a pooled keep-alive session
+class HttpEngine:
+    name = "http"
+
+    def __init__(self, pool_size=HTTP_POOL_SIZE, timeout=HTTP_TIMEOUT):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._forms = {}
+        self._lock = threading.Lock()
+
+    def lookup(self, form, form_url, *args, timeout=None):
+        return form.pick(self.submit(form_url, form.values(args), form.submit_id, form.submit_class, timeout))
+
+    def submit(self, form_url, values, submit_id=None, submit_class=None, timeout=None):
+        form = self.form_for(form_url, next(iter(values)))
+        data = build_form_data(form, values, submit_id, submit_class)
+        target = urljoin(form_url, form["action"] or form_url)
+        timeout = capped(timeout, self.timeout)
+        if form["method"] == "post":
+            response = self.session.post(target, data=data, timeout=timeout)
+        else:
+            response = self.session.get(target, params=data, timeout=timeout)
+        response.raise_for_status()
+        return response.text
+
+    # 🔍 Fetch and parse each form page once per engine, then reuse its layout
+    def form_for(self, form_url, field_id):
+        with self._lock:
+            form = self._forms.get(form_url)
+        if form:
+            return form
+
+        response = self.session.get(form_url, timeout=self.timeout)
+        response.raise_for_status()
+        form = parse_form(response.text, field_id, form_url)
+
+        with self._lock:
+            self._forms[form_url] = form
+        return form
+
+
+def parse_form(html, field_id, form_url):
+    parser = _FormParser()
+    parser.feed(html)
+    form = next((f for f in parser.forms if any(field["id"] == field_id for field in f["fields"])), None)
+    if form is None:
+        raise EngineError(f"No form with field '{field_id}' on {form_url}")
+    return form
+
+
+# ✅ Fill the form's named inputs from {element id: value}, keeping hidden defaults
+def build_form_data(form, values, submit_id=None, submit_class=None):
+    data = {}
+    for field in form["fields"]:
+        if not field["name"]:
+            continue
+        if field["id"] in values:
+            data[field["name"]] = values[field["id"]]
+        elif field["type"] in ("submit", "button", "image"):
+            if field["id"] == submit_id or (submit_class and submit_class in field["class"]):
+                data[field["name"]] = field["value"]
+        elif field["type"] not in ("checkbox", "radio", "reset", "file"):
+            data[field["name"]] = field["value"]
+
+    missing = [key for key in values if not any(f["id"] == key and f["name"] for f in form["fields"])]
+    if missing:
+        raise EngineError(f"Form fields without a name: {', '.join(missing)}")
+    return data
+
+
+def pick_by_class(html, css_class, index):
+    texts = find_by_class(html, css_class)
+    if len(texts) <= index:
+        raise EngineError(f"No '{css_class}' element in the response")
+    return texts[index]
+
+
+# ✅ HTTP first, Selenium when the page is not a plain form post
+class FallbackEngine:
+    def __init__(self, primary, fallback):
+        self.primary = primary
+        self.fallback = fallback
+        self.name = primary.name
+
+    def __getattr__(self, method):
+        primary = getattr(self.primary, method)
+        fallback = getattr(self.fallback, method)
+
+        def call(*args, **kwargs):
+            try:
+                return primary(*args, **kwargs)
+            except EngineError:
+                return fallback(*args, **kwargs)
+        return call
+
+
+_engines = {}
+_engines_lock = threading.Lock()
+
+
+# 🔥 LOOKUP_PRELOAD=1 (processes that run lookup jobs): import the lookup stack in the background
+# at startup, so the first job does not wait for it
+def preload():
+    def load():
+        import requests, selenium.webdriver, openpyxl, pandas  # noqa: E401, F401
+        from . import async_pipeline  # noqa: F401
+        from .driver_pool import chromedriver
+        try:
+            chromedriver()
+        except Exception:
+            pass  # /health reports the error; the first browser retries
+    threading.Thread(target=load, name="lookup-preload", daemon=True).start()
+
+
+# ✅ Engines are shared process-wide so HTTP connections and form layouts are reused
+def get_engine(name=None):
+    name = (name or LOOKUP_ENGINE).lower()
+    if name == "async":
+        # Async sessions belong to one event loop, so every job gets its own engine
+        from .async_pipeline import AsyncHttpEngine
+        return AsyncHttpEngine(fallback=get_engine("selenium"))
+    with _engines_lock:
+        if name not in _engines:
+            if name == "http":
+                _engines[name] = FallbackEngine(HttpEngine(), SeleniumEngine())
+            elif name == "selenium":
+                _engines[name] = SeleniumEngine()
+            elif name == "tabs":
+                # One Chrome, many tabs (tab_engine.py)
+                from .tab_engine import get_tab_engine
+                _engines[name] = get_tab_engine()
+            else:
+                raise ValueError(f"Unknown lookup engine: {name}")
+        return _engines[name]
@@ -0,0 +1,703 @@
+# blueprints/jobs.py
+# ✅ Background lookup jobs: decoupled from the HTTP request, checkpointed to disk, resumable,
+#    started by a priority scheduler with global and per-user concurrency caps
+
+import os
+import json
+import time
+import uuid
+import zlib
+import heapq
+import socket
+import itertools
+import threading
+from flask import Blueprint, Response, request, jsonify, session, redirect, url_for
+
+from .metrics import Gauge
+from .user_store import FileLock
+
+jobs_bp = Blueprint("jobs", __name__)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+JOBS_FOLDER = os.environ.get("JOBS_FOLDER", os.path.join(BASE_DIR, "..", "jobs"))
+os.makedirs(JOBS_FOLDER, exist_ok=True)
+
+HEARTBEAT_SECONDS = float(os.environ.get("SSE_HEARTBEAT_SECONDS", "15"))
+SSE_BATCH_ROWS = int(os.environ.get("SSE_BATCH_ROWS", "50"))
+SSE_BATCH_MS = int(os.environ.get("SSE_BATCH_MS", "250"))
+SSE_PROGRESS_MS = int(os.environ.get("SSE_PROGRESS_MS", "1000"))
+SSE_GZIP = os.environ.get("SSE_GZIP", "1") != "0"
+JOB_MAX_RUNNING = int(os.environ.get("JOB_MAX_RUNNING", "2"))
+JOB_MAX_PER_USER = int(os.environ.get("JOB_MAX_PER_USER", "1"))
+JOB_KEEP_FINISHED = int(os.environ.get("JOB_KEEP_FINISHED", "50"))
+JOB_EVENT_TAIL = int(os.environ.get("JOB_EVENT_TAIL", "256"))
+# 🔐 The process running a job renews its lease in job.json; another worker resumes the job only once
+# the lease has gone JOB_LEASE_SECONDS without a heartbeat, and until then follows its event log
+JOB_LEASE_SECONDS = float(os.environ.get("JOB_LEASE_SECONDS", "30"))
+JOB_FOLLOW_SECONDS = float(os.environ.get("JOB_FOLLOW_SECONDS", "0.5"))
+# 🎟️ A running job holds a slot file under slots/, renewed with its lease, so the JOB_MAX_RUNNING and
+# JOB_MAX_PER_USER caps hold across every worker; queued jobs re-check for a free slot this often
+SLOTS_FOLDER = os.path.join(JOBS_FOLDER, "slots")
+os.makedirs(SLOTS_FOLDER, exist_ok=True)
+JOB_QUEUE_POLL_SECONDS = float(os.environ.get("JOB_QUEUE_POLL_SECONDS", "2"))
+OWNER = f"{socket.gethostname()}:{os.getpid()}"
+
+STATES = ("queued", "running", "done", "failed", "cancelled")
+
+# kind -> generator function(**params, job=job) yielding event dicts.
+# {"row": {...}, "progress": {...}} payloads are batched (see Job.emit_row); anything else is sent as is.
+JOB_TYPES = {}
+
+# Live jobs, plus the JOB_KEEP_FINISHED newest finished ones (their events and rows already released)
+_jobs = {}
+_jobs_lock = threading.Lock()
+
+
+def register_job_type(kind, generate):
+    JOB_TYPES[kind] = generate
+
+
+class Job:
+    def __init__(self, job_id, kind, params, state="queued", user=None, priority=0, created_at=None):
+        self.id = job_id
+        self.kind = kind
+        self.params = params
+        self.state = state
+        self.user = user
+        self.priority = priority
+        self.created_at = created_at or time.time()
+        self.position = None
+        self.cancel_requested = False
+        # Only the newest JOB_EVENT_TAIL events stay in memory (older ones are read back from events.jsonl),
+        # and `completed` holds the rows of an earlier run while resuming; new rows go to rows.jsonl only
+        self.events = []
+        self.completed = {}
+        self.event_count = 0
+        self.completed_rows = 0
+        self.released = False
+        self.owner = OWNER
+        self.heartbeat = None
+        self.dir = os.path.join(JOBS_FOLDER, job_id)
+        self._cond = threading.Condition()
+        self._events_file = None
+        self._rows_file = None
+        self._batch = []
+        self._batch_started = 0.0
+        self._progress = None
+        self._progress_sent = 0.0
+
+    # 💾 Checkpoint one finished row (key must be JSON-serializable)
+    def record(self, key, value):
+        with self._cond:
+            self.completed_rows += 1
+            self._rows_file.write(json.dumps({"key": key, "value": value}, ensure_ascii=False) + "\n")
+            self._rows_file.flush()
+
+    # 📣 Publish one SSE event to every listener and to the on-disk event log
+    def emit(self, payload):
+        with self._cond:
+            self.events.append(payload)
+            if len(self.events) > JOB_EVENT_TAIL:
+                del self.events[0]
+            self.event_count += 1
+            self._events_file.write(json.dumps(payload, ensure_ascii=False) + "\n")
+            self._events_file.flush()
+            self._cond.notify_all()
+
+    # 📦 Rows go out together as {"columns": [...], "rows": [[...], ...]} once SSE_BATCH_ROWS are waiting
+    # or SSE_BATCH_MS after the first one; the counters go out on their own as {"progress": {...}},
+    # at most every SSE_PROGRESS_MS
+    def emit_row(self, row, progress=None):
+        with self._cond:
+            if not self._batch:
+                self._batch_started = time.monotonic()
+            self._batch.append(row)
+            if progress is not None:
+                self._progress = progress
+            if len(self._batch) >= SSE_BATCH_ROWS:
+                self.flush_rows()
+
+    def flush_rows(self, force=False):
+        with self._cond:
+            now = time.monotonic()
+            if self._batch and (force or len(self._batch) >= SSE_BATCH_ROWS
+                                or now - self._batch_started >= SSE_BATCH_MS / 1000):
+                columns = list(dict.fromkeys(key for row in self._batch for key in row))
+                self.emit({"columns": columns, "rows": [[row.get(c) for c in columns] for row in self._batch]})
+                self._batch = []
+            if self._progress is not None and (force or now - self._progress_sent >= SSE_PROGRESS_MS / 1000):
+                self.emit({"progress": self._progress})
+                self._progress = None
+                self._progress_sent = now
+
+    # 💾 Keep values a resumed run must reuse (stored in job.json with the params)
+    def remember(self, **values):
+        with self._cond:
+            self.params.update(values)
+            self.save_meta()
+
+    def set_state(self, state):
+        with self._cond:
+            self.state = state
+            self.save_meta()
+            self._cond.notify_all()
+
+    @property
+    def finished(self):
+        return self.state in ("done", "failed", "cancelled")
+
+    # 🧹 Finished: drop the events and rows kept for live listeners and the resume
+    def release(self):
+        with self._cond:
+            self.events = []
+            self.completed = {}
+            self.released = True
+            self._cond.notify_all()
+
+    def save_meta(self):
+        os.makedirs(self.dir, exist_ok=True)
+        tmp_path = os.path.join(self.dir, "job.json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({**self.to_dict(params=True), "event_count": self.event_count,
+                       "owner": OWNER, "heartbeat": time.time()}, f)
+        os.replace(tmp_path, os.path.join(self.dir, "job.json"))
+
+    # 💓 Renew the lease of a job this process is running or queueing
+    def touch(self):
+        with self._cond:
+            if not self.finished and not self.released:
+                self.save_meta()
+
+    def lease_expired(self):
+        return time.time() - (self.heartbeat or 0) > JOB_LEASE_SECONDS
+
+    # Take over a job whose worker is gone; the lock keeps two workers from both taking it
+    def claim(self):
+        with FileLock(os.path.join(self.dir, "job.lock")):
+            self.refresh()
+            if self.finished or not self.lease_expired():
+                return False
+            self.save_meta()
+            return True
+
+    # State and lease as last written by whichever process owns the job
+    def refresh(self):
+        try:
+            with open(os.path.join(self.dir, "job.json"), encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return
+        self.state, self.owner, self.heartbeat = meta["state"], meta.get("owner"), meta.get("heartbeat")
+        self.event_count = meta.get("event_count", self.event_count)
+        self.completed_rows = meta.get("completed_rows", self.completed_rows)
+
+    def to_dict(self, params=False):
+        info = {
+            "id": self.id, "kind": self.kind, "state": self.state, "user": self.user,
+            "priority": self.priority, "created_at": self.created_at,
+            "position": self.position, "completed_rows": self.completed_rows,
+        }
+        if params:
+            info["params"] = self.params
+        return info
+
+    def open_logs(self):
+        os.makedirs(self.dir, exist_ok=True)
+        if self._events_file is None:
+            self._events_file = open(os.path.join(self.dir, "events.jsonl"), "a", encoding="utf-8")
+            self._rows_file = open(os.path.join(self.dir, "rows.jsonl"), "a", encoding="utf-8")
+
+    def close_logs(self):
+        for f in (self._events_file, self._rows_file):
+            if f:
+                f.close()
+        self._events_file = self._rows_file = None
+
+    # 🔁 Yield (seq, payload) after `after`, waiting for new events until the job finishes
+    def stream(self, after=0):
+        seq = after
+        while True:
+            with self._cond:
+                if seq >= self.event_count and not self.finished and not self.released:
+                    self._cond.wait(HEARTBEAT_SECONDS)
+                if self.released:
+                    break
+                first = self.event_count - len(self.events)  # seq of the event before the in-memory tail
+                pending = self.events[seq - first:] if seq >= first else None
+                finished = self.finished
+            if pending is None:
+                # Behind the tail (a late reconnect): catch up from the log, then carry on from memory
+                path = os.path.join(self.dir, "events.jsonl")
+                for payload in itertools.islice(_iter_jsonl(path), seq, first):
+                    seq += 1
+                    yield seq, payload
+                if seq < first:
+                    return  # log cut short by a crash
+                continue
+            if not pending:
+                if finished:
+                    return
+                yield None, None
+                continue
+            for payload in pending:
+                seq += 1
+                yield seq, payload
+        yield from self._follow(seq)
+
+    # 📜 Released (finished, or running in another worker): the rest comes from the event log.
+    # Ends once the job has finished, or when its owner's lease runs out so the client's reconnect resumes it.
+    def _follow(self, seq):
+        path = os.path.join(self.dir, "events.jsonl")
+        if not os.path.exists(path):
+            return
+        line_no, idle_since = 0, time.monotonic()
+        with open(path, "rb") as f:
+            while True:
+                start = f.tell()
+                line = f.readline()
+                if line.endswith(b"\n"):
+                    line_no += 1
+                    if line_no > seq:
+                        try:
+                            payload = json.loads(line)
+                        except ValueError:
+                            continue
+                        seq, idle_since = line_no, time.monotonic()
+                        yield seq, payload
+                    continue
+                f.seek(start)  # nothing new yet, or a line still being written
+                if self.finished:
+                    return
+                self.refresh()
+                if self.finished:
+                    continue  # read what was written before it finished
+                if self.lease_expired():
+                    return
+                if time.monotonic() - idle_since >= HEARTBEAT_SECONDS:
+                    idle_since = time.monotonic()
+                    yield None, None
+                time.sleep(JOB_FOLLOW_SECONDS)
+
+    # Comes back released (counts only); restore() reads the events and rows a resume continues from
+    @classmethod
+    def load(cls, job_id):
+        job_dir = os.path.join(JOBS_FOLDER, job_id)
+        meta_path = os.path.join(job_dir, "job.json")
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+        job = cls(meta["id"], meta["kind"], meta["params"], meta["state"],
+                  meta.get("user"), meta.get("priority", 0), meta.get("created_at"))
+        job.owner, job.heartbeat, job.released = meta.get("owner"), meta.get("heartbeat"), True
+        job.completed_rows = meta.get("completed_rows", 0)
+        if "event_count" in meta:
+            job.event_count = meta["event_count"]
+        else:
+            job.event_count = sum(1 for _ in _iter_jsonl(os.path.join(job_dir, "events.jsonl")))
+        return job
+
+    def restore(self):
+        self.events, self.event_count = [], 0
+        for payload in _iter_jsonl(os.path.join(self.dir, "events.jsonl")):
+            self.events.append(payload)
+            if len(self.events) > JOB_EVENT_TAIL:
+                del self.events[0]
+            self.event_count += 1
+        self.completed = {r["key"]: r["value"] for r in _iter_jsonl(os.path.join(self.dir, "rows.jsonl"))}
+        self.completed_rows = len(self.completed)
+        self.released = False
+
+
+def _iter_jsonl(path):
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    return  # torn last line from a crash
+
+
+def _run(job):
+    job.open_logs()
+    job.set_state("running")
+    generator = JOB_TYPES[job.kind](**job.params, job=job)
+
+    # ⏱️ Sends a partial batch when rows trickle in slower than SSE_BATCH_MS
+    stop = threading.Event()
+
+    def flush_loop():
+        while not stop.wait(SSE_BATCH_MS / 1000):
+            job.flush_rows()
+
+    flusher = threading.Thread(target=flush_loop, daemon=True)
+    flusher.start()
+    try:
+        for payload in generator:
+            if "row" in payload:
+                job.emit_row(payload["row"], payload.get("progress"))
+            else:
+                job.flush_rows(force=True)
+                job.emit(payload)
+            if job.cancel_requested:
+                generator.close()
+                job.flush_rows(force=True)
+                job.emit({"cancelled": True, "job_id": job.id})
+                job.set_state("cancelled")
+                break
+        else:
+            job.flush_rows(force=True)
+            job.set_state("done")
+    except Exception as e:
+        job.flush_rows(force=True)
+        job.emit({"error": f"Job failed: {str(e)}"})
+        job.set_state("failed")
+    finally:
+        stop.set()
+        flusher.join()
+        job.close_logs()
+        scheduler.job_finished(job)
+        _retire(job)
+
+
+# 🗓️ Starts queued jobs by priority (higher first, then FIFO) within the concurrency caps.
+# The queue and positions belong to this worker; the caps count the slots of every worker.
+class Scheduler:
+    def __init__(self, max_running=JOB_MAX_RUNNING, max_per_user=JOB_MAX_PER_USER):
+        self.max_running = max(1, max_running)
+        self.max_per_user = max(1, max_per_user)
+        self._queue = []
+        self._running = set()
+        self._order = itertools.count()
+        self._lock = threading.Lock()
+        self._poller = None
+
+    def submit(self, job):
+        with self._lock:
+            job.state = "queued"
+            heapq.heappush(self._queue, (-job.priority, next(self._order), job))
+        self._dispatch()
+
+    def cancel(self, job):
+        with self._lock:
+            queued = any(entry[2] is job for entry in self._queue)
+            if queued:
+                self._queue = [entry for entry in self._queue if entry[2] is not job]
+                heapq.heapify(self._queue)
+        if queued:
+            job.open_logs()
+            job.emit({"cancelled": True, "job_id": job.id})
+            job.set_state("cancelled")
+            job.close_logs()
+            _retire(job)
+            self._dispatch()
+        elif job.state == "running":
+            job.cancel_requested = True
+
+    def job_finished(self, job):
+        with self._lock:
+            self._running.discard(job)
+            _remove_slot(job)
+        self._dispatch()
+
+    # queued: waiting in this worker; running: across all workers
+    def stats(self):
+        with self._lock:
+            queued = len(self._queue)
+        return {"queued": queued, "running": len(_read_slots())}
+
+    # 💓 Renew the slots of this worker's running jobs (called with the lease heartbeat)
+    def renew(self):
+        with self._lock:
+            running = list(self._running)
+        for job in running:
+            try:
+                os.utime(os.path.join(SLOTS_FOLDER, job.id))
+            except FileNotFoundError:
+                pass
+
+    def _dispatch(self):
+        to_start, waiting = [], []
+        with self._lock, FileLock(os.path.join(SLOTS_FOLDER, "slots.lock")):
+            slots = _read_slots(purge=True)
+            per_user = {}
+            for user in slots.values():
+                per_user[user] = per_user.get(user, 0) + 1
+            while self._queue:
+                entry = heapq.heappop(self._queue)
+                job = entry[2]
+                if len(slots) < self.max_running and per_user.get(job.user, 0) < self.max_per_user:
+                    self._running.add(job)
+                    slots[job.id] = job.user
+                    per_user[job.user] = per_user.get(job.user, 0) + 1
+                    _write_slot(job)
+                    to_start.append(job)
+                else:
+                    waiting.append(entry)
+            for entry in waiting:
+                heapq.heappush(self._queue, entry)
+            waiting.sort()
+            # A slot freed by another worker wakes nobody here: poll while anything waits
+            if waiting and (self._poller is None or not self._poller.is_alive()):
+                self._poller = threading.Thread(target=self._poll, name="job-queue", daemon=True)
+                self._poller.start()
+
+        for job in to_start:
+            job.position = None
+            threading.Thread(target=_run, args=(job,), daemon=True).start()
+
+        # 📍 Tell waiting clients where they stand
+        for position, (_, _, job) in enumerate(waiting, start=1):
+            if job.position != position:
+                job.position = position
+                job.open_logs()
+                job.emit({"queued": True, "position": position, "job_id": job.id})
+
+    def _poll(self):
+        while True:
+            time.sleep(JOB_QUEUE_POLL_SECONDS)
+            with self._lock:
+                if not self._queue:
+                    self._poller = None
+                    return
+            try:
+                self._dispatch()
+            except OSError as e:
+                print(f"🔴 Job queue poll failed -> {e}")
+
+
+# 🎟️ job_id -> user of every slot renewed within the lease; a crashed worker's slots age out with its leases
+def _read_slots(purge=False):
+    slots = {}
+    for entry in os.scandir(SLOTS_FOLDER):
+        if entry.name.endswith(".lock"):
+            continue
+        try:
+            if time.time() - entry.stat().st_mtime > JOB_LEASE_SECONDS:
+                if purge:
+                    os.remove(entry.path)
+                continue
+            with open(entry.path, encoding="utf-8") as f:
+                slots[entry.name] = json.load(f)["user"]
+        except (OSError, ValueError, KeyError):
+            continue  # released or half-written meanwhile
+    return slots
+
+
+def _write_slot(job):
+    with open(os.path.join(SLOTS_FOLDER, job.id), "w", encoding="utf-8") as f:
+        json.dump({"user": job.user, "owner": OWNER}, f)
+
+
+def _remove_slot(job):
+    try:
+        os.remove(os.path.join(SLOTS_FOLDER, job.id))
+    except FileNotFoundError:
+        pass
+
+
+scheduler = Scheduler()
+
+Gauge("jobs_queued", "Jobs waiting for a free slot", collect=lambda: {(): scheduler.stats()["queued"]})
+Gauge("jobs_running", "Jobs currently running", collect=lambda: {(): scheduler.stats()["running"]})
+
+
+def create_job(kind, params, user=None, priority=0):
+    job = Job(uuid.uuid4().hex, kind, params, user=user, priority=priority)
+    job.open_logs()
+    job.save_meta()
+    job.emit({"job_id": job.id})
+    with _jobs_lock:
+        _jobs[job.id] = job
+    _start_heartbeat()
+    scheduler.submit(job)
+    return job
+
+
+_heartbeat_thread = None
+
+
+def _start_heartbeat():
+    global _heartbeat_thread
+    if _heartbeat_thread is None:
+        _heartbeat_thread = threading.Thread(target=_heartbeat_loop, name="job-lease", daemon=True)
+        _heartbeat_thread.start()
+
+
+def _heartbeat_loop():
+    while True:
+        time.sleep(JOB_LEASE_SECONDS / 3)
+        with _jobs_lock:
+            live = [job for job in _jobs.values() if not job.finished]
+        for job in live:
+            try:
+                job.touch()
+            except OSError as e:
+                print(f"🔴 Could not renew the lease of job {job.id} -> {e}")
+        scheduler.renew()
+
+
+# 🧹 A finished job keeps only its counts in memory, and only the JOB_KEEP_FINISHED newest stay listed
+def _retire(job):
+    job.release()
+    with _jobs_lock:
+        _evict_finished()
+
+
+def _evict_finished():
+    finished = sorted((j for j in _jobs.values() if j.finished), key=lambda j: j.created_at, reverse=True)
+    for job in finished[JOB_KEEP_FINISHED:]:
+        del _jobs[job.id]
+
+
+# ✅ Find a job in memory or on disk; restart it from its checkpoint if its worker's lease ran out.
+# A job another worker still holds is returned released: its events are followed on disk.
+def get_job(job_id, resume=True):
+    if not job_id or not all(c in "0123456789abcdef" for c in job_id):
+        return None
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+        if job is None:
+            job = Job.load(job_id)
+            if job is None:
+                return None
+            if job.finished:
+                _jobs[job_id] = job
+                _evict_finished()
+            elif resume and job.kind in JOB_TYPES and job.lease_expired() and job.claim():
+                job.restore()
+                _jobs[job_id] = job
+                _start_heartbeat()
+                scheduler.submit(job)
+        return job
+
+
+# 🔒 The user who started a job, or a job_queue admin
+def can_access(job):
+    return job.user == session.get("user_id") or "job_queue" in session.get("permissions", [])
+
+
+def parse_last_event_id(value):
+    job_id, _, seq = (value or "").partition(":")
+    return job_id, int(seq) if seq.isdigit() else 0
+
+
+# Compact separators and raw UTF-8 (Bangla names) keep events small before and after gzip
+def sse_stream(job, after=0):
+    for seq, payload in job.stream(after):
+        if payload is None:
+            yield ": keep-alive\n\n"  # heartbeat comment so proxies keep the connection open
+        else:
+            yield f"id: {job.id}:{seq}\ndata: {json.dumps(payload, ensure_ascii=False, separators=(',', ':'))}\n\n"
+
+
+# 🗜️ One gzip stream for the whole response, sync-flushed after every event so nothing waits in the buffer
+def gzip_stream(chunks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        yield compressor.compress(chunk.encode("utf-8")) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush()
+
+
+# ✅ Shared by every blueprint's /process: reconnect via Last-Event-ID (or ?job_id=), else start a new job
+def job_response(kind, params):
+    job_id, after = parse_last_event_id(request.headers.get("Last-Event-ID"))
+    if request.args.get("job_id"):
+        job_id = request.args.get("job_id")
+        after = request.args.get("last_event_id", 0, type=int)
+    job = get_job(job_id) if job_id else None
+    if job is not None and not can_access(job):
+        return jsonify({"error": "Access Denied"}), 403
+    if job is None:
+        priority = request.args.get("priority", 0, type=int)
+        job = create_job(kind, params, user=session.get("user_id"), priority=priority)
+        after = 0
+    return stream_response(job, after)
+
+
+def stream_response(job, after):
+    # 204 tells EventSource to stop reconnecting once a finished job has nothing left to send
+    if job.finished and after >= job.event_count:
+        return Response(status=204)
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    body = sse_stream(job, after)
+    if SSE_GZIP and "gzip" in request.accept_encodings:
+        body = gzip_stream(body)
+        headers.update({"Content-Encoding": "gzip", "Vary": "Accept-Encoding"})
+    return Response(body, mimetype="text/event-stream", headers=headers)
+
+
+@jobs_bp.route("/jobs/<job_id>/events")
+def job_events(job_id):
+    if "user_id" not in session:
+        return jsonify({"error": "Unauthorized"}), 401
+    job = get_job(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    if not can_access(job):
+        return jsonify({"error": "Access Denied"}), 403
+    _, after = parse_last_event_id(request.headers.get("Last-Event-ID"))
+    after = request.args.get("last_event_id", after, type=int)
+    return stream_response(job, after)
+
+
+@jobs_bp.route("/jobs/<job_id>")
+def job_status(job_id):
+    if "user_id" not in session:
+        return jsonify({"error": "Unauthorized"}), 401
+    job = get_job(job_id, resume=False)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    if not can_access(job):
+        return jsonify({"error": "Access Denied"}), 403
+    return jsonify(job.to_dict())
+
+
+# ✅ Jobs of every worker, newest first: all of them for job_queue admins, else the user's own.
+# Read from the jobs folder (most recently written first); this worker's own jobs add their queue position.
+def list_jobs(limit=100):
+    with _jobs_lock:
+        local = dict(_jobs)
+    written = []
+    for entry in os.scandir(JOBS_FOLDER):
+        try:
+            written.append((os.stat(os.path.join(entry.path, "job.json")).st_mtime, entry.name))
+        except OSError:
+            continue  # not a job folder, or just removed
+    written.sort(reverse=True)
+    jobs = []
+    for _, job_id in written:
+        try:
+            job = local.get(job_id) or Job.load(job_id)
+        except (OSError, ValueError, KeyError):
+            continue
+        if job is not None and can_access(job):
+            jobs.append(job)
+            if len(jobs) >= limit:
+                break
+    jobs.sort(key=lambda j: j.created_at, reverse=True)
+    return [job.to_dict() for job in jobs]
+
+
+@jobs_bp.route("/jobs")
+def jobs_list():
+    if "user_id" not in session:
+        return jsonify({"error": "Unauthorized"}), 401
+    return jsonify({"jobs": list_jobs(), **scheduler.stats()})
+
+
+@jobs_bp.route("/jobs/<job_id>/cancel", methods=["POST"])
+def job_cancel(job_id):
+    if "user_id" not in session:
+        return jsonify({"error": "Unauthorized"}), 401
+    job = get_job(job_id, resume=False)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    if not can_access(job):
+        return jsonify({"error": "Access Denied"}), 403
+    if not job.finished:
+        scheduler.cancel(job)
+    if request.form.get("next") == "dashboard":
+        return redirect(url_for("dashboard.dashboard"))
+    return jsonify(job.to_dict())
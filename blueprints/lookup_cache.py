@@ -0,0 +1,115 @@
+# blueprints/lookup_cache.py
+# ✅ Persistent SQLite cache of upstream lookups, keyed by (job type, normalized inputs)
+
+import os
+import json
+import time
+import sqlite3
+import threading
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_PATH = os.environ.get("LOOKUP_CACHE_PATH", os.path.join(BASE_DIR, "..", "lookup_cache.sqlite3"))
+CACHE_ENABLED = os.environ.get("LOOKUP_CACHE_ENABLED", "1") != "0"
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+# ⏱️ How long a successful lookup stays valid, per job type
+CACHE_TTLS = {
+    "mbbs_result": 6 * HOUR,
+    "bds_result": 6 * HOUR,
+    "mbbs_user_id": 30 * DAY,
+    "bds_user_id": 30 * DAY,
+    "mbbs_pass_recover": DAY,
+    "bds_pass_recover": DAY,
+}
+DEFAULT_TTL = 6 * HOUR
+# "Result not found" / "Sorry, User ID not found" may change soon, so keep them briefly
+NEGATIVE_TTL = int(os.environ.get("LOOKUP_CACHE_NEGATIVE_TTL", str(HOUR)))
+# Expired rows are deleted when a job opens the cache, at most this often per process
+PURGE_SECONDS = int(os.environ.get("LOOKUP_CACHE_PURGE_SECONDS", str(HOUR)))
+
+_local = threading.local()
+_schema_lock = threading.Lock()
+_schema_ready = set()
+_purged_at = {}
+
+
+def _connect(path):
+    connections = getattr(_local, "connections", None)
+    if connections is None:
+        connections = _local.connections = {}
+    if path not in connections:
+        conn = sqlite3.connect(path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        with _schema_lock:
+            if path not in _schema_ready:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS lookups ("
+                    " job_type TEXT NOT NULL,"
+                    " key TEXT NOT NULL,"
+                    " value TEXT NOT NULL,"
+                    " negative INTEGER NOT NULL DEFAULT 0,"
+                    " expires_at REAL NOT NULL,"
+                    " PRIMARY KEY (job_type, key))"
+                )
+                conn.commit()
+                _schema_ready.add(path)
+        connections[path] = conn
+    return connections[path]
+
+
+class LookupCache:
+    def __init__(self, job_type, is_negative=None, ttl=None, negative_ttl=NEGATIVE_TTL, path=CACHE_PATH,
+                 is_error=None):
+        self.job_type = job_type
+        self.is_negative = is_negative or (lambda value: False)
+        self.is_error = is_error or (lambda value: False)
+        self.ttl = ttl or CACHE_TTLS.get(job_type, DEFAULT_TTL)
+        self.negative_ttl = negative_ttl
+        self.path = path
+
+    @staticmethod
+    def make_key(args):
+        return json.dumps([str(a).strip() for a in args], ensure_ascii=False)
+
+    # 🔍 Returns (hit, value)
+    def get(self, args):
+        row = _connect(self.path).execute(
+            "SELECT value, expires_at FROM lookups WHERE job_type = ? AND key = ?",
+            (self.job_type, self.make_key(args)),
+        ).fetchone()
+        if row is None or row[1] < time.time():
+            return False, None
+        return True, json.loads(row[0])
+
+    # Error answers (upstream "failed" pages) are never stored
+    def put(self, args, value):
+        if self.is_error(value):
+            return
+        negative = bool(self.is_negative(value))
+        ttl = self.negative_ttl if negative else self.ttl
+        conn = _connect(self.path)
+        conn.execute(
+            "INSERT OR REPLACE INTO lookups (job_type, key, value, negative, expires_at) VALUES (?, ?, ?, ?, ?)",
+            (self.job_type, self.make_key(args), json.dumps(value, ensure_ascii=False), int(negative), time.time() + ttl),
+        )
+        conn.commit()
+
+    def purge_expired(self):
+        conn = _connect(self.path)
+        conn.execute("DELETE FROM lookups WHERE expires_at < ?", (time.time(),))
+        conn.commit()
+
+
+# ✅ Cache for a job type, or None when caching is switched off
+def get_cache(job_type, is_negative=None, is_error=None):
+    if not CACHE_ENABLED:
+        return None
+    cache = LookupCache(job_type, is_negative, is_error=is_error)
+    now = time.time()
+    if now - _purged_at.get(cache.path, 0) >= PURGE_SECONDS:
+        _purged_at[cache.path] = now
+        cache.purge_expired()
+    return cache
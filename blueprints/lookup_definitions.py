@@ -0,0 +1,70 @@
+# blueprints/lookup_definitions.py
+# ✅ Every lookup the app runs, as configuration. A new exam or lookup type is one more entry in
+#    LOOKUP_JOBS (plus its page, templates/pages/<kind>.html); routes and jobs come from lookup_jobs.py.
+
+from .engines import Form, pass_form_url, result_form_url, user_id_form_url
+from .lookup_jobs import Input, LookupJob, mobile_number, stripped
+
+# 📝 Upstream forms: input element ids, submit control, answer elements
+USER_ID_FORM = Form(fields=("sname", "sfather", "smobile"), submit_id="button01",
+                    result_class="red12bold", result_index=0)
+PASSWORD_FORM = Form(fields=("inv", "smobile"), submit_id="button01",
+                     result_class="red12bold", result_index=1, field_timeout=5, result_timeout=8)
+RESULT_FORM = Form(fields=("roll2",), submit_class="search_btn", result_class="stones")
+
+# Result_1..7 on the DGHS page -> result file columns
+RESULT_COLUMNS = ("Roll No", "Student Name", "Test Score", "Merit Score", "Merit Position",
+                  "Allotted College Code", "Status")
+
+
+def user_id_job(exam):
+    return LookupJob(
+        kind=f"{exam}_user_id",
+        form=USER_ID_FORM,
+        form_url=user_id_form_url(exam),
+        inputs=[
+            Input("name_col", "Name", docx_column="Name"),
+            Input("father_col", "Father's Name", docx_column="Father's Name"),
+            Input("mobile_col", "Mobile Number", docx_column="Mobile Number", clean=mobile_number),
+        ],
+        result_columns=[f"{exam.upper()} User ID"],
+        statuses=[("not_found", "Sorry, User ID not found")],
+        file_prefix="Live_Result",
+    )
+
+
+def password_job(exam):
+    return LookupJob(
+        kind=f"{exam}_pass_recover",
+        form=PASSWORD_FORM,
+        form_url=pass_form_url(exam),
+        inputs=[
+            Input("user_col", "User ID", docx_column="USER_ID"),
+            Input("mobile_col", "Mobile Number", docx_column="Mobile Number", clean=mobile_number),
+        ],
+        result_columns=["Result"],
+        output="report",
+        statuses=[("not_found", "sorry"), ("error", "fail"), ("error", "error")],
+    )
+
+
+def result_job(exam):
+    roll = f"{exam.upper()}_Roll"
+    return LookupJob(
+        kind=f"{exam}_result",
+        form=RESULT_FORM,
+        form_url=result_form_url(exam),
+        inputs=[Input("roll_col", roll, default=roll, clean=stripped)],
+        result_columns=RESULT_COLUMNS,
+        output="merge",
+    )
+
+
+LOOKUP_JOBS = [
+    result_job("mbbs"),
+    result_job("bds"),
+    password_job("mbbs"),
+    password_job("bds"),
+    user_id_job("mbbs"),
+    user_id_job("bds"),
+]
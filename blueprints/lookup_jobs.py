@@ -0,0 +1,319 @@
+# blueprints/lookup_jobs.py
+# ✅ One lookup-job engine for every exam and lookup type. Each type is a LookupJob definition
+#    (see lookup_definitions.py); this module turns a definition into its upload / process / download
+#    routes and runs its jobs on the shared engines, driver pool, cache, checkpoints and result writer.
+
+import os
+import uuid
+
+from flask import Blueprint, request, render_template, jsonify, send_file, session, redirect, url_for
+
+from .engines import ENGINES, get_engine
+from .jobs import job_response, register_job_type
+from .lookup_cache import get_cache
+from .metrics import JobMetrics
+from .parallel import lookup_stats, run_lookups
+from .readers import file_ext, is_cached, iter_rows, read_columns, save_upload
+from .result_writer import RESULT_FORMAT, OrderedOutput, ResultWriter, format_available
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+UPLOAD_FOLDER = os.path.join(BASE_DIR, "..", "uploads")
+RESULT_FOLDER = os.path.join(BASE_DIR, "..", "results")
+
+os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+os.makedirs(RESULT_FOLDER, exist_ok=True)
+
+# How the answer lands in the result file
+OUTPUTS = (
+    "merge",   # joined onto the uploaded sheet by the first input (the roll), see result_merge.py
+    "append",  # uploaded row + result columns
+    "report",  # inputs + result + status only
+)
+
+
+# 🧹 Cell cleaners for Input(clean=...)
+def stripped(value):
+    return str(value).strip()
+
+
+def mobile_number(value):
+    mobile = str(value).strip()
+    return mobile if mobile.startswith("0") else "0" + mobile
+
+
+# 👯 Rows asking the same question (key columns equal after stripping) share one lookup.
+# -> ({first row: [later rows with the same key]}, number of distinct keys, number of rows)
+def group_duplicates(rows, key):
+    first, followers, total = {}, {}, 0
+    for idx, row in rows:
+        total += 1
+        try:
+            k = tuple(str(value).strip() for value in key(row))
+        except Exception:
+            k = ("", idx)  # unreadable row: looked up alone, fails the way it always did
+        leader = first.setdefault(k, idx)
+        if leader != idx:
+            followers.setdefault(leader, []).append(idx)
+    return followers, len(first), total
+
+
+# 📥 One value typed into the upstream form, read from a column of the uploaded sheet
+class Input:
+    def __init__(self, param, label, docx_column=None, default=None, clean=str):
+        self.param = param              # query parameter naming the sheet column (?name_col=...)
+        self.label = label              # key in the streamed rows and report files
+        self.docx_column = docx_column  # fixed column in DOCX tables; None = same as for sheets
+        self.default = default          # column used when the parameter is not given
+        self.clean = clean
+
+
+class LookupJob:
+    def __init__(self, kind, form, form_url, inputs, result_columns, output="append", statuses=(), file_prefix="result"):
+        if output not in OUTPUTS:
+            raise ValueError(f"Unknown output: {output}")
+        self.kind = kind
+        self.form = form
+        self.form_url = form_url
+        self.inputs = tuple(inputs)
+        self.result_columns = tuple(result_columns)
+        self.output = output
+        # (status, text) pairs checked in order against the answer, case-insensitively; no match = "found"
+        self.statuses = tuple((status, text.lower()) for status, text in statuses)
+        self.file_prefix = file_prefix
+
+    @property
+    def url(self):
+        return f"/{self.kind}"
+
+    # 🏷️ found / not_found / error for an upstream answer (an empty answer is "not_found")
+    def status(self, result):
+        if not result:
+            return "not_found"
+        text = (" ".join(result) if isinstance(result, list) else str(result)).lower()
+        for status, marker in self.statuses:
+            if marker in text:
+                return status
+        return "found"
+
+    # Checkpointed per row, so it stays JSON-serializable
+    def record(self, args, result, error):
+        args = list(args) if args else [""] * len(self.inputs)
+        if error is not None:
+            message = f"Error: {str(error)}"
+            return {"args": args, "result": [message] if self.form.returns_list else message, "status": "error"}
+        status = self.status(result)
+        if self.form.returns_list and not result:
+            result = ["Result not found"]
+        return {"args": args, "result": result, "status": status}
+
+    # Answer under the names the pages read (Result_1..n for list answers)
+    def result_fields(self, result):
+        if self.form.returns_list:
+            return {f"Result_{i + 1}": r for i, r in enumerate(result)}
+        return {self.result_columns[0]: result}
+
+    # Answer under the result file's column names
+    def named_results(self, result):
+        if self.form.returns_list:
+            return dict(zip(self.result_columns, result))
+        return {self.result_columns[0]: result}
+
+    def row_event(self, record):
+        event = {inp.label: value for inp, value in zip(self.inputs, record["args"])}
+        event.update(self.result_fields(record["result"]))
+        event["Status"] = record["status"]
+        return event
+
+    def output_columns(self, sheet_columns):
+        if self.output == "report":
+            return [inp.label for inp in self.inputs] + list(self.result_columns) + ["Status"]
+        return [c for c in sheet_columns if c not in self.result_columns] + list(self.result_columns)
+
+    # ✅ A contiguous batch of (sheet row, record) -> result file rows
+    def build_rows(self, batch, columns):
+        if self.output == "report":
+            return [{**{inp.label: value for inp, value in zip(self.inputs, record["args"])},
+                     **self.named_results(record["result"]), "Status": record["status"]}
+                    for _, record in batch]
+        if self.output == "append":
+            return [{**row, **self.named_results(record["result"])} for row, record in batch]
+
+        import pandas as pd
+        from .result_merge import merge_results
+        key = self.inputs[0].label
+        merged = merge_results(pd.DataFrame([row for row, _ in batch]), columns[self.inputs[0].param], [
+            {key: record["args"][0], **self.result_fields(record["result"])} for _, record in batch
+        ], key)
+        rename_map = {f"Result_{i + 1}": name for i, name in enumerate(self.result_columns)}
+        return merged.rename(columns=rename_map).to_dict("records")
+
+    # ✅ Job generator: yields SSE payloads; rows already checkpointed by `job` are not looked up again
+    def generate(self, file_path, workers=None, engine=None, output_format=None, output_stem=None, job=None,
+                 **params):
+        docx = file_ext(file_path) == "docx"
+        sheet_columns = read_columns(file_path)
+        if docx and not sheet_columns:
+            yield {'error': 'No data found in the document'}
+            return
+
+        columns = {}
+        for inp in self.inputs:
+            columns[inp.param] = inp.docx_column if docx and inp.docx_column else (params.get(inp.param) or inp.default)
+        if not all(columns.values()):
+            yield {'error': 'Missing column selections'}
+            return
+        if any(column not in sheet_columns for column in columns.values()):
+            yield {'error': 'Invalid column'}
+            return
+
+        def prepare(row):
+            return tuple(inp.clean(row[columns[inp.param]]) for inp in self.inputs)
+
+        # ⚖️ The totals and the duplicate groups need every row, so this one pass over the roster comes before
+        # the first lookup (it also counts the rows; with the parsed-roster cache a re-run reads pickles)
+        followers, unique_rows, total_rows = group_duplicates(iter_rows(file_path), prepare)
+        if docx and total_rows < 1:
+            yield {'error': 'No data found in the document'}
+            return
+        duplicates = {idx for group in followers.values() for idx in group}
+        yield {
+            'total_rows': total_rows, 'unique_rows': unique_rows,
+            'dedup_ratio': round(len(duplicates) / total_rows, 4) if total_rows else 0,
+        }
+
+        engine = get_engine(engine)
+        cache = get_cache(self.kind, is_negative=lambda result: self.status(result) == "not_found",
+                          is_error=lambda result: self.status(result) == "error")
+        stats = lookup_stats()
+        metrics = JobMetrics(self.kind)
+        counts = {"not_found": 0, "error": 0, "found": 0}
+        processed = 0
+
+        def progress():
+            return {
+                "Processed": processed, "Total": total_rows, "NotFound": counts["not_found"],
+                "ErrorCount": counts["error"], "Found": counts["found"], **stats,
+            }
+
+        # ✅ Counters are only touched here, on the streaming thread
+        def apply(idx, record, live=True):
+            nonlocal processed
+            counts[record["status"]] += 1
+            processed += 1
+            output.add(idx, record)
+            if live:
+                metrics.row(record["status"])
+
+        # ✅ Rows are appended to the result file as they finish; the partial file is downloadable all along.
+        # A resumed run rewrites the same files, so links handed out before the restart keep working.
+        out_columns = self.output_columns(sheet_columns)
+        if not output_stem:
+            output_stem = f"{self.file_prefix}_{uuid.uuid4().hex}"
+            if job:
+                job.remember(output_stem=output_stem)
+        writer = ResultWriter(RESULT_FOLDER, output_stem, out_columns, output_format)
+        output = OrderedOutput(iter_rows(file_path), writer, lambda batch: self.build_rows(batch, columns))
+        yield {'partial_download': f"{self.url}/download?file={writer.partial_filename}"}
+
+        # Duplicates of `idx` not done yet get its record (checkpointed like looked-up rows)
+        def fan_out(idx, record, live=True):
+            for dup in followers.get(idx, ()):
+                if job and dup in job.completed:
+                    continue
+                if job:
+                    job.record(dup, record)
+                apply(dup, record, live)
+                yield dup
+
+        # 🔁 Resuming: restore checkpointed rows without re-emitting them
+        if job and job.completed:
+            for idx, record in list(job.completed.items()):
+                apply(idx, record, live=False)
+                for _ in fan_out(idx, record, live=False):
+                    pass
+            yield {"progress": progress(), "Resumed": processed}
+
+        leaders = ((idx, row) for idx, row in iter_rows(file_path) if idx not in duplicates)
+        lookups = run_lookups(leaders, engine, self.form, self.form_url, prepare, self.record,
+                              workers, cache, stats, job, metrics)
+        try:
+            for idx, record in lookups:
+                if idx is None:
+                    # ⏸️ Upstream circuit open: queued rows wait `record` seconds before their retry
+                    yield {"Paused": True, "RetryIn": record, "progress": progress()}
+                    continue
+                apply(idx, record)
+                yield {"row": self.row_event(record), "progress": progress()}
+                for _ in fan_out(idx, record):
+                    yield {"row": self.row_event(record), "progress": progress()}
+        finally:
+            output.close()
+
+        yield {
+            'download': f"{self.url}/download?file={writer.filename}", 'total_rows': total_rows,
+            'processed': processed, 'not_found': counts["not_found"], 'error_count': counts["error"],
+            'found': counts["found"], **stats, 'metrics': metrics.summary(writer.write_seconds),
+        }
+
+
+# ✅ Page, upload, process and download routes for one definition; also registers its job type
+def lookup_blueprint(definition):
+    bp = Blueprint(definition.kind, __name__)
+    url = definition.url
+
+    @bp.route(url)
+    def index():
+        if "user" not in session:
+            return redirect(url_for("auth.login"))
+        return render_template(f"pages/{definition.kind}.html")
+
+    @bp.route(f"{url}/upload", methods=["POST"])
+    def upload():
+        file = request.files.get("file") or request.files.get("input_file")
+        if not file or file.filename == "":
+            return jsonify({"error": "No file uploaded"}), 400
+
+        ext = file.filename.rsplit(".", 1)[-1].lower()
+        if ext not in ("xlsx", "xls", "docx"):
+            return jsonify({"error": "Unsupported file type"}), 400
+        # 🔑 Stored by content hash: the same roster uploaded again reuses its file and parsed rows
+        file_path, digest = save_upload(file.stream, UPLOAD_FOLDER, ext)
+        info = {"file_path": file_path, "sha256": digest, "cached": is_cached(file_path)}
+
+        if ext == "docx":
+            return jsonify({"type": "docx", **info})
+        return jsonify({"type": "excel", **info, "columns": read_columns(file_path)})
+
+    @bp.route(f"{url}/process")
+    def process():
+        file_path = request.args.get("file_path")
+        workers = request.args.get("workers", type=int)
+        engine = request.args.get("engine")
+        output_format = request.args.get("format", RESULT_FORMAT).lower()
+
+        if not file_path or not os.path.exists(file_path):
+            return jsonify({"error": "File not found"}), 400
+        if engine and engine not in ENGINES:
+            return jsonify({"error": "Unknown engine"}), 400
+        if not format_available(output_format):
+            return jsonify({"error": "Unsupported format"}), 400
+
+        return job_response(definition.kind, {
+            "file_path": file_path, "workers": workers, "engine": engine, "output_format": output_format,
+            **{inp.param: request.args.get(inp.param) for inp in definition.inputs},
+        })
+
+    @bp.route(f"{url}/download")
+    def download():
+        filename = request.args.get("file")
+        if not filename:
+            return "File parameter missing", 400
+        path = os.path.abspath(os.path.join(RESULT_FOLDER, filename))
+        if not path.startswith(os.path.abspath(RESULT_FOLDER) + os.sep):
+            return "Invalid file path", 403
+        if os.path.exists(path):
+            return send_file(path, as_attachment=True)
+        return f"File not found: {filename}", 404
+
+    register_job_type(definition.kind, definition.generate)
+    return bp
@@ -1,60 +1,22 @@
-import os, json, uuid
-from flask import Blueprint, render_template, request, redirect, url_for, flash, session
+import io
+import csv
+from flask import Blueprint, Response, render_template, request, redirect, url_for, flash, session, jsonify
+from .user_store import load_users, find_user_by_pin, user_store, user_version, UserStoreError, VersionConflict
+from .activity_log import ACTION_TYPES, log_activity
+from .activity_index import activity_index, parse_time, PAGE_SIZE
 
 management_bp = Blueprint("management", __name__)
 
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-USER_DATA_FILE = os.path.join(BASE_DIR, "..", "users.json")
-LOG_FILE = os.path.join(BASE_DIR, "..", "activity_logs.json")
-
-
-# 🔄 Load all users
-def load_users():
-    if os.path.exists(USER_DATA_FILE):
-        with open(USER_DATA_FILE, "r") as f:
-            try:
-                return json.load(f)
-            except json.JSONDecodeError:
-                return []
-    return []
-
-# 💾 Save all users
-def save_users(users):
-    with open(USER_DATA_FILE, "w") as f:
-        json.dump(users, f, indent=2)
-
-# 🧾 Log an activity
-def log_activity(user_id, action):
-    logs = []
-    if os.path.exists(LOG_FILE):
-        with open(LOG_FILE, "r") as f:
-            try:
-                logs = json.load(f)
-            except json.JSONDecodeError:
-                logs = []
-    logs.append({
-        "id": str(uuid.uuid4()),
-        "user": user_id,
-        "action": action
-    })
-    with open(LOG_FILE, "w") as f:
-        json.dump(logs, f, indent=2)
-
 # ✅ Add Member
 @management_bp.route("/management/add_members", methods=["GET", "POST"])
 def add_members():
     if request.method == "POST":
-        users = load_users()
         user_id = request.form.get("user_id", "").strip()
 
         if not user_id:
             flash("User ID is required.", "danger")
             return redirect(url_for("management.add_members"))
 
-        if any(u["user_id"] == user_id for u in users):
-            flash("User ID already exists!", "danger")
-            return redirect(url_for("management.add_members"))
-
         new_user = {
             "user_id": user_id,
             "pin": request.form.get("pin", "").strip(),
@@ -69,8 +31,14 @@ def add_members():
             "mobile": ""
         }
 
-        users.append(new_user)
-        save_users(users)
+        try:
+            added = user_store.add(new_user)
+        except UserStoreError as e:
+            flash(f"Could not save: {e}", "danger")
+            return redirect(url_for("management.add_members"))
+        if not added:
+            flash("User ID already exists!", "danger")
+            return redirect(url_for("management.add_members"))
         log_activity(session.get("user", "admin"), f"Added new member: {user_id}")
         flash("✅ Member added successfully!", "success")
         return redirect(url_for("management.add_members"))
@@ -80,55 +48,134 @@ def add_members():
 # ✅ Permission Setup via PIN
 @management_bp.route("/management/permission", methods=["GET", "POST"])
 def permission_setup():
-    users = load_users()
     selected_user_pin = request.form.get("user_pin") if request.method == "POST" else request.args.get("user_pin")
-    selected_user = next((u for u in users if u.get("pin") == selected_user_pin), None)
+    selected_user = find_user_by_pin(selected_user_pin)
 
     if request.method == "POST" and "permissions" in request.form:
         permissions = request.form.getlist("permissions")
         if selected_user:
-            selected_user["permissions"] = permissions
-            save_users(users)
-            log_activity(session.get("user", "admin"), f"Updated permissions for PIN: {selected_user_pin}")
-            flash("✅ Permissions updated!", "success")
+            try:
+                user_store.update(selected_user["user_id"], {"permissions": permissions},
+                                  version=request.form.get("version"))
+                log_activity(session.get("user", "admin"), f"Updated permissions for PIN: {selected_user_pin}")
+                flash("✅ Permissions updated!", "success")
+            except VersionConflict:
+                flash("⚠️ This user was changed by someone else. Review the current permissions and save again.", "danger")
+            except UserStoreError as e:
+                flash(f"Could not save: {e}", "danger")
         return redirect(url_for("management.permission_setup", user_pin=selected_user_pin))
 
     return render_template("pages/permission_setup.html",
-                           users=users,
                            selected_user=selected_user,
-                           selected_user_pin=selected_user_pin)
+                           selected_user_pin=selected_user_pin,
+                           version=user_version(selected_user) if selected_user else "")
 
 # ✅ Edit User Info
 @management_bp.route("/management/user_info_edit", methods=["GET", "POST"])
 def user_info_edit():
-    users = load_users()
     if request.method == "POST":
         user_id = request.form.get("user_id", "").strip()
-        for user in users:
-            if user["user_id"] == user_id:
-                user["info"] = {
-                    "name": request.form.get("name", "").strip(),
-                    "phone": request.form.get("phone", "").strip(),
-                    "designation": request.form.get("designation", "").strip()
-                }
-                save_users(users)
-                log_activity(session.get("user", "admin"), f"Edited info for {user_id}")
-                flash("✅ Info updated successfully!", "success")
-                return redirect(url_for("management.user_info_edit"))
+        info = {
+            "name": request.form.get("name", "").strip(),
+            "phone": request.form.get("phone", "").strip(),
+            "designation": request.form.get("designation", "").strip()
+        }
+        try:
+            updated = user_store.update(user_id, {"info": info}, version=request.form.get(f"version_{user_id}"))
+        except VersionConflict:
+            flash("⚠️ This user was changed by someone else. Check the current info and save again.", "danger")
+            return redirect(url_for("management.user_info_edit"))
+        except UserStoreError as e:
+            flash(f"Could not save: {e}", "danger")
+            return redirect(url_for("management.user_info_edit"))
+        if updated:
+            log_activity(session.get("user", "admin"), f"Edited info for {user_id}")
+            flash("✅ Info updated successfully!", "success")
+            return redirect(url_for("management.user_info_edit"))
 
         flash("User not found.", "danger")
         return redirect(url_for("management.user_info_edit"))
 
+    users = [{**u, "version": user_version(u)} for u in load_users()]
     return render_template("pages/user_info_edit.html", users=users)
 
-# ✅ View Activity Logs
+# 🔍 Filters shared by the log page, the JSON API and the CSV export (ValueError on a bad time)
+def log_filters(args):
+    return {
+        "user": args.get("user", "").strip() or None,
+        "kind": args.get("type", "").strip() or None,
+        "since": parse_time(args.get("since")),
+        "until": parse_time(args.get("until")),
+    }
+
+
+def log_page(args):
+    return activity_index.page(**log_filters(args),
+                               before=args.get("before", type=int),
+                               after=args.get("after", type=int),
+                               limit=args.get("limit", PAGE_SIZE, type=int))
+
+
+def render_activity_logs(args):
+    if not can_view_logs():
+        return "Access Denied", 403
+    try:
+        page = log_page(args)
+    except ValueError:
+        return "Invalid time filter", 400
+    filters = {k: args[k] for k in ("user", "type", "since", "until") if args.get(k)}
+    return render_template("pages/activity_logs.html", logs=page["entries"], page=page,
+                           filters=filters, action_types=list(ACTION_TYPES) + ["other"])
+
+
+def can_view_logs():
+    return "activity_logs" in session.get("permissions", [])
+
+
+# ✅ View Activity Logs (one page at a time)
 @management_bp.route("/management/activity_logs")
 def activity_logs():
-    logs = []
-    if os.path.exists(LOG_FILE):
-        with open(LOG_FILE, "r") as f:
-            try:
-                logs = json.load(f)
-            except json.JSONDecodeError:
-                logs = []
-    return render_template("pages/activity_logs.html", logs=logs)
+    if "user_id" not in session:
+        return redirect(url_for("auth.login"))
+    return render_activity_logs(request.args)
+
+
+# ✅ Activity Logs as JSON: ?user=&type=&since=&until=&before=|after=&limit=
+@management_bp.route("/management/api/activity_logs")
+def activity_logs_api():
+    if "user_id" not in session:
+        return jsonify({"error": "Unauthorized"}), 401
+    if not can_view_logs():
+        return jsonify({"error": "Access Denied"}), 403
+    try:
+        return jsonify(log_page(request.args))
+    except ValueError:
+        return jsonify({"error": "Invalid time filter"}), 400
+
+
+# ⬇ CSV export of every entry matching the filters, streamed in batches
+@management_bp.route("/management/activity_logs/export.csv")
+def activity_logs_export():
+    if "user_id" not in session:
+        return jsonify({"error": "Unauthorized"}), 401
+    if not can_view_logs():
+        return jsonify({"error": "Access Denied"}), 403
+    try:
+        filters = log_filters(request.args)
+    except ValueError:
+        return jsonify({"error": "Invalid time filter"}), 400
+
+    def generate():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(["ts", "user", "type", "action", "id"])
+        for n, entry in enumerate(activity_index.iter_entries(**filters), start=1):
+            writer.writerow([entry["ts"] or "", entry["user"] or "", entry["type"], entry["action"], entry["id"]])
+            if n % 500 == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+
+    return Response(generate(), mimetype="text/csv",
+                    headers={"Content-Disposition": "attachment; filename=activity_logs.csv"})
@@ -0,0 +1,226 @@
+# blueprints/metrics.py
+# ✅ Process metrics in Prometheus text format (no client library needed): counters, gauges and
+#    histograms with labels, the /metrics endpoint, and the per-job summary sent in the final SSE event
+
+import time
+import threading
+from array import array
+
+from flask import Blueprint, Response, jsonify
+
+metrics_bp = Blueprint("metrics", __name__)
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+REGISTRY = []
+
+# name -> function returning a JSON-serializable dict, reported by /health
+HEALTH_CHECKS = {}
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _number(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def _key(self, labels):
+        return tuple(str(labels.get(name, "")) for name in self.labels)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for name, values, extra, value in self.samples():
+            lines.append(f"{name}{_labels(self.labels, values, extra)} {_number(value)}")
+        return lines
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            values = sorted(self._values.items())
+        for key, value in values:
+            yield self.name, key, (), value
+
+
+# Set directly, or computed at scrape time by collect() -> {label values tuple: value}
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name, help, labels=(), collect=None):
+        super().__init__(name, help, labels)
+        self.collect = collect
+
+    def set(self, value, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def samples(self):
+        if self.collect is not None:
+            values = self.collect() or {}
+        else:
+            with self._lock:
+                values = dict(self._values)
+        for key, value in sorted(values.items()):
+            yield self.name, key, (), value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help, labels=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            # One slot per bucket plus one for values above the last bucket
+            counts, total = self._values.get(key, ([0] * (len(self.buckets) + 1), 0.0))
+            slot = next((i for i, bound in enumerate(self.buckets) if value <= bound), len(self.buckets))
+            counts[slot] += 1
+            self._values[key] = (counts, total + value)
+
+    def samples(self):
+        with self._lock:
+            values = sorted((key, (list(counts), total)) for key, (counts, total) in self._values.items())
+        for key, (counts, total) in values:
+            running = 0
+            for bound, count in zip(self.buckets, counts):
+                running += count
+                yield f"{self.name}_bucket", key, [("le", _number(float(bound)))], running
+            yield f"{self.name}_bucket", key, [("le", "+Inf")], sum(counts)
+            yield f"{self.name}_sum", key, (), total
+            yield f"{self.name}_count", key, (), sum(counts)
+
+    def time(self, **labels):
+        return _Timer(self, labels)
+
+
+class _Timer:
+    def __init__(self, histogram, labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.monotonic()
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed = time.monotonic() - self.started
+        self.histogram.observe(self.elapsed, **self.labels)
+        return False
+
+
+def render():
+    lines = []
+    for metric in REGISTRY:
+        lines += metric.render()
+    return "\n".join(lines) + "\n"
+
+
+@metrics_bp.route("/metrics")
+def metrics():
+    return Response(render(), mimetype="text/plain; version=0.0.4")
+
+
+def health_check(name, check):
+    HEALTH_CHECKS[name] = check
+
+
+# 🩺 Liveness plus whatever the modules registered (resolved chromedriver, driver pool)
+@metrics_bp.route("/health")
+def health():
+    return jsonify({"status": "ok", **{name: check() for name, check in HEALTH_CHECKS.items()}})
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * p / 100))]
+
+
+# 📊 Lookup metrics, fed by parallel.run_lookups and lookup_jobs
+LOOKUP_ROW_SECONDS = Histogram("lookup_row_seconds", "Time to look up one row, retries included", ("kind",))
+LOOKUP_ROWS = Counter("lookup_rows_total", "Rows finished, by lookup type and status", ("kind", "status"))
+UPSTREAM_REQUESTS = Counter("upstream_requests_total", "Upstream lookup attempts by outcome (ok, transient, error)",
+                            ("kind", "outcome"))
+ROWS_PER_SECOND = Gauge("lookup_rows_per_second", "Throughput of the most recent job of each lookup type", ("kind",))
+
+
+# ✅ One job's share of the lookup metrics, summarized in its final SSE event
+class JobMetrics:
+    def __init__(self, kind):
+        self.kind = kind
+        self.started = time.monotonic()
+        self.rows = 0
+        self.attempts = 0
+        self.failed_attempts = 0
+        self._row_seconds = array("d")
+        self._lock = threading.Lock()
+
+    # Called from worker threads
+    def attempt(self, outcome):
+        UPSTREAM_REQUESTS.inc(kind=self.kind, outcome=outcome)
+        with self._lock:
+            self.attempts += 1
+            self.failed_attempts += outcome != "ok"
+
+    def looked_up(self, seconds):
+        LOOKUP_ROW_SECONDS.observe(seconds, kind=self.kind)
+        with self._lock:
+            self._row_seconds.append(seconds)
+
+    # Called on the streaming thread for every row finished in this run
+    def row(self, status):
+        LOOKUP_ROWS.inc(kind=self.kind, status=status)
+        self.rows += 1
+        ROWS_PER_SECOND.set(round(self.rows_per_second, 3), kind=self.kind)
+
+    @property
+    def rows_per_second(self):
+        elapsed = time.monotonic() - self.started
+        return self.rows / elapsed if elapsed > 0 else 0.0
+
+    def summary(self, write_seconds=0.0):
+        with self._lock:
+            seconds = sorted(self._row_seconds)
+        rounded = lambda v: None if v is None else round(v, 3)  # noqa: E731
+        return {
+            "elapsed_seconds": round(time.monotonic() - self.started, 3),
+            "rows_per_second": round(self.rows_per_second, 3),
+            "row_p50_seconds": rounded(percentile(seconds, 50)),
+            "row_p95_seconds": rounded(percentile(seconds, 95)),
+            "row_max_seconds": rounded(seconds[-1] if seconds else None),
+            "upstream_requests": self.attempts,
+            "upstream_error_rate": round(self.failed_attempts / self.attempts, 4) if self.attempts else 0.0,
+            "write_seconds": round(write_seconds, 3),
+        }
@@ -0,0 +1,273 @@
+# blueprints/parallel.py
+# ✅ Multi-worker row processing shared by the lookup blueprints
+
+import os
+import time
+import asyncio
+import functools
+import threading
+from queue import Queue, Empty, Full
+
+from .engines import is_transient
+from .resilience import RETRY_ATTEMPTS, RETRY_MAX_PAUSE, CircuitOpen, backoff, upstream_for
+
+LOOKUP_WORKERS = int(os.environ.get("LOOKUP_WORKERS", "1"))
+PAUSE_NOTICE_SECONDS = 5
+
+_END = object()
+
+
+def resolve_workers(workers=None):
+    return max(1, workers or LOOKUP_WORKERS)
+
+
+# ✅ Run handler(item) for every (key, item) pair and yield (key, result) as rows finish.
+# Workers pull from one shared queue; all results come back to the calling thread,
+# so counters and DataFrame updates done by the caller need no locking.
+def run_parallel(items, handler, workers=None):
+    workers = resolve_workers(workers)
+    if workers == 1:
+        for key, item in items:
+            yield key, handler(item)
+        return
+
+    tasks = Queue(maxsize=workers * 4)
+    done = Queue()
+    stop = threading.Event()
+
+    def put_task(task):
+        while not stop.is_set():
+            try:
+                tasks.put(task, timeout=0.5)
+                return True
+            except Full:
+                continue
+        return False
+
+    def feed():
+        try:
+            for pair in items:
+                if not put_task(pair):
+                    return
+        except Exception as e:
+            done.put((None, None, e))
+        finally:
+            for _ in range(workers):
+                put_task(_END)
+
+    def work():
+        while not stop.is_set():
+            task = tasks.get()
+            if task is _END:
+                break
+            key, item = task
+            try:
+                done.put((key, handler(item), None))
+            except Exception as e:
+                done.put((key, None, e))
+        done.put(_END)
+
+    threads = [threading.Thread(target=feed, daemon=True)]
+    threads += [threading.Thread(target=work, daemon=True) for _ in range(workers)]
+    for t in threads:
+        t.start()
+
+    finished = 0
+    try:
+        while finished < workers:
+            message = done.get()
+            if message is _END:
+                finished += 1
+                continue
+            key, result, error = message
+            if error is not None:
+                raise error
+            yield key, result
+    finally:
+        # 🛑 Client disconnected or a row failed: let the workers wind down
+        stop.set()
+        try:
+            while True:
+                tasks.get_nowait()
+        except Empty:
+            pass
+        for _ in range(workers):
+            try:
+                tasks.put_nowait(_END)
+            except Full:
+                break
+
+
+# Stand-in for a row whose lookup failed on a transient error; it goes to the end-of-job retry queue
+class _Deferred:
+    def __init__(self, args):
+        self.args = args
+
+
+# ✅ One engine lookup of `form` per row, on thread workers or on the asyncio pipeline for async engines.
+# prepare(item) -> lookup args; finish(args, result, error) -> value yielded with the key.
+# With a cache, hits skip the upstream call; hit/miss counts land in stats on this thread.
+# With a job, every finished row is checkpointed before it is yielded.
+# With metrics (metrics.JobMetrics), every upstream attempt and per-row lookup time is recorded.
+#
+# 🔁 Transient failures (engines.is_transient) are retried with backoff up to RETRY_ATTEMPTS times; rows that
+# still fail, or that meet an open circuit breaker, are queued and tried once more after every other row.
+# While the breaker is open before that pass, (None, seconds until retry) is yielded as a pause notice.
+def run_lookups(items, engine, form, form_url, prepare, finish, workers=None, cache=None, stats=None, job=None,
+                metrics=None):
+    call = functools.partial(engine.lookup, form)
+    workers = workers or getattr(engine, "workers", None)  # the tab engine: one worker per tab
+    upstream = upstream_for(form_url)
+    breaker = upstream.breaker
+    if job is not None:
+        # Rows checkpointed by an earlier run are skipped; fresh ones are checkpointed below
+        items = ((key, item) for key, item in items if key not in job.completed)
+
+    def cached(args):
+        if cache is None:
+            return None, False
+        hit, result = cache.get(args)
+        return result, hit
+
+    def failed(error, retries):
+        transient = is_transient(error)
+        if metrics is not None:
+            metrics.attempt("transient" if transient else "error")
+        if not transient:
+            breaker.success()  # the upstream answered; the request itself was bad
+            return True
+        breaker.failure()
+        return retries + 1 >= RETRY_ATTEMPTS
+
+    def succeeded(started):
+        upstream.latency.observe(time.monotonic() - started)
+        breaker.success()
+        if metrics is not None:
+            metrics.attempt("ok")
+
+    # -> (value, cache hit, retries); `defer` queues transient failures instead of finishing them.
+    # `started` is when this row's upstream lookup began (None for cache hits / bad rows).
+    def settle(args, result, error, hit, retries, defer, started=None):
+        if error is not None and defer and (isinstance(error, CircuitOpen) or is_transient(error)):
+            return _Deferred(args), hit, retries
+        if metrics is not None and started is not None:
+            metrics.looked_up(time.monotonic() - started)
+        if error is None and not hit and cache is not None:
+            cache.put(args, result)
+        return finish(args, result, error), hit, retries
+
+    if getattr(engine, "is_async", False):
+        from .async_pipeline import run_async
+
+        async def attempt_async(args, defer):
+            retries = 0
+            while True:
+                if not breaker.allow() and (defer or not await breaker.wait_async()):
+                    return None, CircuitOpen(f"{upstream.host} is not responding"), retries
+                started = time.monotonic()
+                try:
+                    result = await call(form_url, *args, timeout=upstream.latency.timeout())
+                except Exception as e:
+                    if failed(e, retries):
+                        return None, e, retries
+                    await asyncio.sleep(backoff(retries))
+                    retries += 1
+                    continue
+                succeeded(started)
+                return result, None, retries
+
+        async def handle_async(item, defer=True):
+            args = result = error = started = None
+            hit = False
+            retries = 0
+            try:
+                args = prepare(item)
+                result, hit = cached(args)
+                if not hit:
+                    started = time.monotonic()
+                    result, error, retries = await attempt_async(args, defer)
+            except Exception as e:
+                error = e
+            return settle(args, result, error, hit, retries, defer, started)
+
+        async def retry_async(args):
+            started = time.monotonic()
+            result, error, retries = await attempt_async(args, False)
+            return settle(args, result, error, False, retries, False, started)
+
+        pairs = run_async(items, handle_async, engine, workers)
+        retry_pairs = lambda queued: run_async(queued, retry_async, engine, workers)  # noqa: E731
+    else:
+        def attempt(args, defer):
+            retries = 0
+            while True:
+                if not breaker.allow() and (defer or not breaker.wait()):
+                    return None, CircuitOpen(f"{upstream.host} is not responding"), retries
+                started = time.monotonic()
+                try:
+                    result = call(form_url, *args, timeout=upstream.latency.timeout())
+                except Exception as e:
+                    if failed(e, retries):
+                        return None, e, retries
+                    time.sleep(backoff(retries))
+                    retries += 1
+                    continue
+                succeeded(started)
+                return result, None, retries
+
+        def handle(item):
+            args = result = error = started = None
+            hit = False
+            retries = 0
+            try:
+                args = prepare(item)
+                result, hit = cached(args)
+                if not hit:
+                    started = time.monotonic()
+                    result, error, retries = attempt(args, True)
+            except Exception as e:
+                error = e
+            return settle(args, result, error, hit, retries, True, started)
+
+        def retry(args):
+            started = time.monotonic()
+            result, error, retries = attempt(args, False)
+            return settle(args, result, error, False, retries, False, started)
+
+        pairs = run_parallel(items, handle, workers)
+        retry_pairs = lambda queued: run_parallel(queued, retry, workers)  # noqa: E731
+
+    queued = []
+    for key, (value, hit, retries) in pairs:
+        if stats is not None:
+            if cache is not None:
+                stats["CacheHits" if hit else "CacheMisses"] += 1
+            stats["Retries"] += retries
+        if isinstance(value, _Deferred):
+            queued.append((key, value.args))
+            if stats is not None:
+                stats["Requeued"] += 1
+            continue
+        if job is not None:
+            job.record(key, value)
+        yield key, value
+
+    if not queued:
+        return
+
+    # ⏸️ Upstream down: hold the job (with pause notices) instead of failing the queued rows right away
+    paused_until = time.monotonic() + RETRY_MAX_PAUSE
+    while breaker.retry_in() > 0 and time.monotonic() < paused_until:
+        yield None, round(breaker.retry_in())
+        time.sleep(min(PAUSE_NOTICE_SECONDS, breaker.retry_in()))
+
+    for key, (value, hit, retries) in retry_pairs(queued):
+        if stats is not None:
+            stats["Retries"] += retries + 1
+        if job is not None:
+            job.record(key, value)
+        yield key, value
+
+
+def lookup_stats():
+    return {"CacheHits": 0, "CacheMisses": 0, "Retries": 0, "Requeued": 0}
@@ -0,0 +1,305 @@
+# blueprints/readers.py
+# ✅ Streaming readers for uploaded rosters: headers from the first row only, rows one at a time.
+#    A roster is parsed once per content: the parsed rows are cached under its SHA-256 and every later
+#    read (the job's counting, dedup and lookup passes, re-uploads, resumed jobs) comes from the cache.
+
+import os
+import pickle
+import hashlib
+import zipfile
+import threading
+import xml.etree.ElementTree as ET
+
+from .metrics import Counter
+
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ROSTER_CACHE_ENABLED = os.environ.get("ROSTER_CACHE_ENABLED", "1") != "0"
+ROSTER_CACHE_FOLDER = os.environ.get("ROSTER_CACHE_FOLDER", os.path.join(BASE_DIR, "..", "uploads", "parsed"))
+ROSTER_CACHE_BATCH = 1000
+HASH_CHUNK = 1024 * 1024
+
+ROSTER_CACHE = Counter("roster_cache_total", "Roster reads served from the parsed cache (hit) or parsed (miss)",
+                       ("outcome",))
+
+
+def file_ext(path):
+    return path.rsplit(".", 1)[-1].lower()
+
+
+# 🏷️ Header cells -> column names, the way pandas names them ("Unnamed: 3", "Name.1")
+def _column_names(header):
+    names, seen = [], {}
+    for i, value in enumerate(header):
+        name = f"Unnamed: {i}" if value is None or str(value) == "" else str(value)
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+
+# ✅ XLSX via openpyxl read-only mode (rows are parsed lazily from the sheet XML)
+def _xlsx_rows(path):
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        yield from workbook.active.iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+# ✅ DOCX tables straight from word/document.xml; python-docx would load the whole tree.
+# Rows of every top-level table are chained together; merged cells repeat their text
+# like python-docx's row.cells does.
+def _docx_rows(path):
+    with zipfile.ZipFile(path) as archive, archive.open("word/document.xml") as xml:
+        depth = 0
+        row = cell = None
+        above = []
+        for event, el in ET.iterparse(xml, events=("start", "end")):
+            if event == "start":
+                if el.tag == f"{W}tbl":
+                    depth += 1
+                    if depth == 1:
+                        above = []
+                elif depth == 1 and el.tag == f"{W}tr":
+                    row = []
+                elif depth == 1 and el.tag == f"{W}tc":
+                    cell = []
+                continue
+
+            if el.tag == f"{W}tbl":
+                depth -= 1
+            elif depth == 0 and el.tag == f"{W}p":
+                el.clear()
+            elif depth != 1:
+                continue
+            elif el.tag == f"{W}p" and cell is not None:
+                cell.append("".join(t.text or "" for t in el.iter(f"{W}t")))
+            elif el.tag == f"{W}tc" and cell is not None:
+                props = el.find(f"{W}tcPr")
+                span, continued = 1, False
+                if props is not None:
+                    grid_span = props.find(f"{W}gridSpan")
+                    if grid_span is not None:
+                        span = int(grid_span.get(f"{W}val", "1"))
+                    v_merge = props.find(f"{W}vMerge")
+                    continued = v_merge is not None and v_merge.get(f"{W}val", "continue") == "continue"
+                col = len(row)
+                text = "\n".join(cell).strip()
+                if continued and col < len(above):
+                    text = above[col]
+                row.extend([text] * span)
+                cell = None
+            elif el.tag == f"{W}tr" and row is not None:
+                yield row
+                above, row = row, None
+                el.clear()
+
+
+# Legacy .xls has no streaming reader; fall back to pandas for it
+def _xls_rows(path):
+    import pandas as pd
+    df = pd.read_excel(path, header=None)
+    for values in df.itertuples(index=False, name=None):
+        yield tuple(None if pd.isna(v) else v for v in values)
+
+
+def _raw_rows(path):
+    ext = file_ext(path)
+    if ext == "docx":
+        return _docx_rows(path)
+    if ext == "xls":
+        return _xls_rows(path)
+    return _xlsx_rows(path)
+
+
+# 🔑 SHA-256 of a file's content, remembered while its size and mtime stay the same
+_hashes = {}
+_hashes_lock = threading.Lock()
+
+
+def _stat_key(path):
+    stat = os.stat(path)
+    return os.path.abspath(path), stat.st_size, stat.st_mtime_ns
+
+
+def remember_hash(path, digest):
+    with _hashes_lock:
+        if len(_hashes) > 1024:
+            _hashes.clear()
+        _hashes[_stat_key(path)] = digest
+
+
+def content_hash(path):
+    key = _stat_key(path)
+    with _hashes_lock:
+        digest = _hashes.get(key)
+    if digest is None:
+        sha = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+                sha.update(chunk)
+        digest = sha.hexdigest()
+        remember_hash(path, digest)
+    return digest
+
+
+# 📥 Stream an upload to disk, hashing as it goes; the file is stored as <sha256>.<ext>, so the same
+# roster uploaded again is stored (and parsed) once. -> (path, digest)
+def save_upload(stream, folder, ext):
+    sha = hashlib.sha256()
+    tmp_path = os.path.join(folder, f".upload-{os.getpid()}-{threading.get_ident()}.tmp")
+    with open(tmp_path, "wb") as f:
+        for chunk in iter(lambda: stream.read(HASH_CHUNK), b""):
+            sha.update(chunk)
+            f.write(chunk)
+    digest = sha.hexdigest()
+    path = os.path.join(folder, f"{digest}.{ext}")
+    if os.path.exists(path):
+        os.remove(tmp_path)
+    else:
+        os.replace(tmp_path, path)
+    remember_hash(path, digest)
+    return path, digest
+
+
+# Data rows as iter_rows yields them: (index, values padded to the header), trailing blank rows dropped.
+# seen[0] ends up as the number of rows yielded.
+def _data_rows(rows, width, seen):
+    blank_run = []
+    for idx, values in enumerate(rows):
+        values = ["" if v is None else v for v in values]
+        values = (values + [""] * width)[:width]
+        if all(v == "" for v in values):
+            blank_run.append((idx, values))
+        else:
+            yield from blank_run
+            blank_run = []
+            seen[0] = idx + 1
+            yield idx, values
+
+
+# v2: counts without trailing blank rows
+def _cache_paths(digest):
+    base = os.path.join(ROSTER_CACHE_FOLDER, f"{digest}.v2")
+    return f"{base}.meta.pickle", f"{base}.rows.pickle"
+
+
+def _load_meta(path):
+    meta_path, _ = _cache_paths(content_hash(path))
+    try:
+        with open(meta_path, "rb") as f:
+            return pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        return None
+
+
+# 💾 Parse the file once into the cache: the rows as pickled batches of ROSTER_CACHE_BATCH (cell values keep
+# their types), then a small meta file (columns, row count) that marks the entry complete
+def _build_cache(path):
+    meta_path, rows_path = _cache_paths(content_hash(path))
+    os.makedirs(ROSTER_CACHE_FOLDER, exist_ok=True)
+    suffix = f".{os.getpid()}-{threading.get_ident()}.tmp"
+    rows = _raw_rows(path)
+    try:
+        header = next(rows, None)
+        columns = _column_names(header) if header is not None else []
+        seen = [0]
+        with open(rows_path + suffix, "wb") as f:
+            batch = []
+            for item in (_data_rows(rows, len(columns), seen) if header is not None else ()):
+                batch.append(item)
+                if len(batch) >= ROSTER_CACHE_BATCH:
+                    pickle.dump(batch, f, pickle.HIGHEST_PROTOCOL)
+                    batch = []
+            if batch:
+                pickle.dump(batch, f, pickle.HIGHEST_PROTOCOL)
+    finally:
+        rows.close()
+    meta = {"columns": columns, "count": seen[0]}
+    with open(meta_path + suffix, "wb") as f:
+        pickle.dump(meta, f, pickle.HIGHEST_PROTOCOL)
+    os.replace(rows_path + suffix, rows_path)
+    os.replace(meta_path + suffix, meta_path)
+    return meta
+
+
+# ✅ Cached meta for the file, parsing it first on a miss; None with the cache turned off
+def _parsed(path):
+    if not ROSTER_CACHE_ENABLED:
+        return None
+    meta = _load_meta(path)
+    ROSTER_CACHE.inc(outcome="hit" if meta else "miss")
+    return meta or _build_cache(path)
+
+
+def _cached_rows(path):
+    _, rows_path = _cache_paths(content_hash(path))
+    with open(rows_path, "rb") as f:
+        while True:
+            try:
+                yield from pickle.load(f)
+            except EOFError:
+                return
+
+
+# Re-upload of a roster already parsed: its columns come from the cache
+def is_cached(path):
+    return ROSTER_CACHE_ENABLED and _load_meta(path) is not None
+
+
+# ✅ Column names from the first row only (or from the cache)
+def read_columns(path):
+    meta = _load_meta(path) if ROSTER_CACHE_ENABLED else None
+    if meta:
+        return meta["columns"]
+    rows = _raw_rows(path)
+    try:
+        header = next(rows, None)
+    finally:
+        rows.close()
+    return _column_names(header) if header is not None else []
+
+
+# ✅ Number of rows iter_rows yields (header and trailing blank rows excluded), without holding the rows.
+# The sheet dimension is no shortcut: it counts blank rows that only carry formatting.
+def count_rows(path):
+    meta = _parsed(path)
+    if meta:
+        return meta["count"]
+    rows = _raw_rows(path)
+    try:
+        header = next(rows, None)
+        if header is None:
+            return 0
+        seen = [0]
+        for _ in _data_rows(rows, len(header), seen):
+            pass
+        return seen[0]
+    finally:
+        rows.close()
+
+
+# ✅ Yield (row index, {column: value}) for every data row; blank cells become "".
+# Indexes count from 0 like a pandas RangeIndex, so job checkpoints stay valid.
+# Trailing all-blank rows (formatting leftovers) are dropped, as pandas does.
+def iter_rows(path):
+    meta = _parsed(path)
+    if meta:
+        columns = meta["columns"]
+        for idx, values in _cached_rows(path):
+            yield idx, dict(zip(columns, values))
+        return
+    rows = _raw_rows(path)
+    header = next(rows, None)
+    if header is None:
+        return
+    columns = _column_names(header)
+    for idx, values in _data_rows(rows, len(columns), [0]):
+        yield idx, dict(zip(columns, values))
@@ -0,0 +1,153 @@
+# blueprints/resilience.py
+# ✅ Per-upstream resilience: retries with exponential backoff and jitter, timeouts adapted from
+#    observed latency, and a circuit breaker that stops calling an upstream while it is down
+
+import os
+import time
+import random
+import asyncio
+import threading
+from collections import deque
+from urllib.parse import urlparse
+
+from .metrics import Gauge
+
+# ⚙️ Retry / timeout / breaker settings (environment variables)
+RETRY_ATTEMPTS = int(os.environ.get("RETRY_ATTEMPTS", "3"))
+RETRY_BASE_DELAY = float(os.environ.get("RETRY_BASE_DELAY", "0.5"))
+RETRY_MAX_DELAY = float(os.environ.get("RETRY_MAX_DELAY", "8"))
+RETRY_MAX_PAUSE = float(os.environ.get("RETRY_MAX_PAUSE", "300"))
+BREAKER_THRESHOLD = int(os.environ.get("BREAKER_THRESHOLD", "5"))
+BREAKER_COOLDOWN = float(os.environ.get("BREAKER_COOLDOWN", "30"))
+TIMEOUT_MIN = float(os.environ.get("ADAPTIVE_TIMEOUT_MIN", "2"))
+TIMEOUT_FACTOR = float(os.environ.get("ADAPTIVE_TIMEOUT_FACTOR", "3"))
+LATENCY_WINDOW = int(os.environ.get("LATENCY_WINDOW", "200"))
+LATENCY_MIN_SAMPLES = 20
+
+
+class CircuitOpen(Exception):
+    """The upstream's breaker is open, so the call was not attempted."""
+
+
+# ⏳ Full jitter: attempt n waits uniform(0, min(cap, base * 2**n))
+def backoff(attempt, base=RETRY_BASE_DELAY, cap=RETRY_MAX_DELAY):
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+# 📈 Recent successful lookup times; the timeout follows their p95
+class LatencyTracker:
+    def __init__(self, window=LATENCY_WINDOW):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def observe(self, seconds):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, p):
+        with self._lock:
+            samples = sorted(self._samples)
+        if len(samples) < LATENCY_MIN_SAMPLES:
+            return None
+        return samples[min(len(samples) - 1, int(len(samples) * p / 100))]
+
+    # None until there are enough samples (engines then use their configured waits)
+    def timeout(self):
+        p95 = self.percentile(95)
+        if p95 is None:
+            return None
+        return max(TIMEOUT_MIN, p95 * TIMEOUT_FACTOR)
+
+
+# 🔌 closed --(threshold transient failures in a row)--> open --(cooldown)--> half-open: one trial call,
+# which closes it again on success or re-opens it on failure
+class CircuitBreaker:
+    def __init__(self, threshold=BREAKER_THRESHOLD, cooldown=BREAKER_COOLDOWN):
+        self.threshold = max(1, threshold)
+        self.cooldown = cooldown
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trips = 0
+        self._lock = threading.Lock()
+
+    # True = go ahead and call; in half-open only the first caller gets the trial
+    def allow(self):
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.cooldown:
+                self.state = "half_open"
+                return True
+            return False
+
+    # Seconds until a call may be tried again (0 when closed or the cooldown is over)
+    def retry_in(self):
+        with self._lock:
+            if self.state == "closed":
+                return 0
+            return max(0.0, self.opened_at + self.cooldown - time.monotonic())
+
+    def success(self):
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+
+    def failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == "half_open" or (self.state == "closed" and self.failures >= self.threshold):
+                self.state = "open"
+                self.opened_at = time.monotonic()
+                self.trips += 1
+
+    # Block until allowed (True) or `timeout` seconds pass (False)
+    def wait(self, timeout=RETRY_MAX_PAUSE):
+        deadline = time.monotonic() + timeout
+        while not self.allow():
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(min(0.5, self.retry_in() or 0.5))
+        return True
+
+    async def wait_async(self, timeout=RETRY_MAX_PAUSE):
+        deadline = time.monotonic() + timeout
+        while not self.allow():
+            if time.monotonic() >= deadline:
+                return False
+            await asyncio.sleep(min(0.5, self.retry_in() or 0.5))
+        return True
+
+
+# 🌐 Latency and breaker for one upstream host, shared by every job calling it
+class Upstream:
+    def __init__(self, host):
+        self.host = host
+        self.latency = LatencyTracker()
+        self.breaker = CircuitBreaker()
+
+
+_upstreams = {}
+_upstreams_lock = threading.Lock()
+
+
+def upstream_for(url):
+    host = urlparse(url).hostname or ""
+    with _upstreams_lock:
+        if host not in _upstreams:
+            _upstreams[host] = Upstream(host)
+        return _upstreams[host]
+
+
+def _per_upstream(value):
+    def collect():
+        with _upstreams_lock:
+            upstreams = list(_upstreams.values())
+        return {(u.host,): v for u in upstreams if (v := value(u)) is not None}
+    return collect
+
+
+Gauge("upstream_circuit_open", "1 while calls to the upstream are suspended by its breaker", ("host",),
+      collect=_per_upstream(lambda u: int(u.breaker.state != "closed")))
+Gauge("upstream_latency_p95_seconds", "p95 of recent successful lookups against the upstream", ("host",),
+      collect=_per_upstream(lambda u: u.latency.percentile(95)))
@@ -0,0 +1,33 @@
+# blueprints/result_merge.py
+# ✅ Keyed merge of scraped results back onto the uploaded sheet (shared by mbbs/bds result)
+
+import pandas as pd
+
+
+# Same normalization used when the rolls were read for lookup: str() + strip()
+def normalize_rolls(series):
+    return series.astype(str).str.strip()
+
+
+# ✅ One join instead of a boolean mask per entry.
+# Duplicate rolls: within one call a roll has one result (the last entry in input order wins)
+# and it is written to every sheet row carrying that roll. Rows without a result are left blank.
+def merge_results(df, roll_col, result_data, key_col):
+    final_df = df.copy()
+    if not result_data:
+        return final_df
+
+    results = pd.DataFrame(result_data)
+    results[key_col] = results[key_col].astype(str)
+    results = results.drop_duplicates(subset=key_col, keep="last").set_index(key_col)
+
+    aligned = results.reindex(normalize_rolls(final_df[roll_col]).to_numpy())
+    aligned.index = final_df.index
+
+    for col in aligned.columns:
+        if col in final_df.columns:
+            # Existing sheet column: only overwrite the rows that got a result
+            final_df[col] = aligned[col].where(aligned[col].notna(), final_df[col])
+        else:
+            final_df[col] = aligned[col]
+    return final_df
@@ -0,0 +1,143 @@
+# blueprints/result_writer.py
+# ✅ Incremental result files: rows are appended in input order as lookups finish,
+#    flushed every RESULT_FLUSH_ROWS rows / RESULT_FLUSH_SECONDS, readable mid-run
+
+import os
+import csv
+import time
+
+from .metrics import Histogram
+
+RESULT_FORMATS = ("xlsx", "csv", "parquet")
+RESULT_FORMAT = os.environ.get("RESULT_FORMAT", "xlsx").lower()
+RESULT_FLUSH_ROWS = int(os.environ.get("RESULT_FLUSH_ROWS", "200"))
+RESULT_FLUSH_SECONDS = float(os.environ.get("RESULT_FLUSH_SECONDS", "5"))
+
+WRITE_SECONDS = Histogram("result_write_seconds", "Time spent writing one batch of result rows (or closing the file)",
+                          ("format", "step"))
+
+
+# ✅ Parquet needs pyarrow, which is optional
+def format_available(fmt):
+    if fmt not in RESULT_FORMATS:
+        return False
+    if fmt == "parquet":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            return False
+    return True
+
+
+def _cell(value):
+    # NaN (a row the keyed merge found no result for) -> empty cell
+    if value is None or value != value:
+        return None
+    return value
+
+
+# ✅ One output file. xlsx uses openpyxl's write-only mode (rows spill to a temp file, not RAM),
+# parquet writes one row group per flush. Those formats are only valid once closed, so rows
+# are also appended to a CSV snapshot that can be downloaded at any time; CSV output is its own snapshot.
+class ResultWriter:
+    def __init__(self, folder, stem, columns, fmt=None):
+        self.fmt = (fmt or RESULT_FORMAT).lower()
+        if not format_available(self.fmt):
+            raise ValueError(f"Unsupported result format: {self.fmt}")
+        self.columns = list(columns)
+        self.filename = f"{stem}.{self.fmt}"
+        self.path = os.path.join(folder, self.filename)
+        self.partial_filename = self.filename if self.fmt == "csv" else f"{stem}.partial.csv"
+        self.partial_path = os.path.join(folder, self.partial_filename)
+        self.rows_written = 0
+        self.write_seconds = 0.0
+
+        self._csv_file = open(self.partial_path, "w", newline="", encoding="utf-8-sig")
+        self._csv = csv.writer(self._csv_file)
+        self._csv.writerow(self.columns)
+        self._csv_file.flush()
+
+        self._book = self._sheet = self._parquet = None
+        if self.fmt == "xlsx":
+            from openpyxl import Workbook
+            self._book = Workbook(write_only=True)
+            self._sheet = self._book.create_sheet()
+            self._sheet.append(self.columns)
+        elif self.fmt == "parquet":
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            self._schema = pa.schema([(str(c), pa.string()) for c in self.columns])
+            self._parquet = pq.ParquetWriter(self.path, self._schema)
+
+    def write_rows(self, rows):
+        started = time.monotonic()
+        values = [[_cell(row.get(c)) for c in self.columns] for row in rows]
+        self._csv.writerows([["" if v is None else v for v in r] for r in values])
+        self._csv_file.flush()
+
+        if self._sheet is not None:
+            for r in values:
+                self._sheet.append(r)
+        elif self._parquet is not None:
+            import pyarrow as pa
+            columns = list(zip(*values)) if values else [[] for _ in self.columns]
+            self._parquet.write_table(pa.table(
+                {str(c): [None if v is None else str(v) for v in col] for c, col in zip(self.columns, columns)},
+                schema=self._schema,
+            ))
+        self.rows_written += len(rows)
+        self._timed("write", started)
+
+    def close(self):
+        started = time.monotonic()
+        self._csv_file.close()
+        if self._book is not None:
+            self._book.save(self.path)
+        if self._parquet is not None:
+            self._parquet.close()
+        if self.partial_path != self.path:
+            os.remove(self.partial_path)
+        self._timed("close", started)
+        return self.path
+
+    def _timed(self, step, started):
+        elapsed = time.monotonic() - started
+        self.write_seconds += elapsed
+        WRITE_SECONDS.observe(elapsed, format=self.fmt, step=step)
+
+
+# ✅ Puts finished lookups back in input order and joins them onto the input rows.
+# `rows` is a fresh iter_rows() pass over the upload, so input rows are never held in memory;
+# only lookups that finished ahead of a slower row wait in `ready`.
+# build([(row, value), ...]) turns a contiguous batch into output row dicts.
+class OrderedOutput:
+    def __init__(self, rows, writer, build, flush_rows=RESULT_FLUSH_ROWS, flush_seconds=RESULT_FLUSH_SECONDS):
+        self.rows = rows
+        self.writer = writer
+        self.build = build
+        self.flush_rows = max(1, flush_rows)
+        self.flush_seconds = flush_seconds
+        self.ready = {}
+        self.batch = []
+        self._next = next(self.rows, None)
+        self._flushed_at = time.monotonic()
+
+    def add(self, idx, value):
+        self.ready[idx] = value
+        while self._next is not None and self._next[0] in self.ready:
+            idx, row = self._next
+            self.batch.append((row, self.ready.pop(idx)))
+            self._next = next(self.rows, None)
+        if len(self.batch) >= self.flush_rows or (self.batch and time.monotonic() - self._flushed_at >= self.flush_seconds):
+            self.flush()
+
+    def flush(self):
+        if self.batch:
+            self.writer.write_rows(self.build(self.batch))
+            self.batch = []
+        self._flushed_at = time.monotonic()
+
+    def close(self):
+        self.flush()
+        self.rows.close()
+        return self.writer.close()
@@ -0,0 +1,244 @@
+# blueprints/tab_engine.py
+# ✅ Tab engine: one headless Chrome, BROWSER_TABS tabs with a lookup in flight in each. A dispatcher thread
+#    owns the browser: it submits forms in every free tab without waiting for the answer (script clicks
+#    don't block on navigation), then walks the busy tabs collecting red12bold / stones answers as they
+#    appear. Worker threads call lookup() like on any engine and block until their tab has answered.
+
+import os
+import time
+import atexit
+import functools
+import threading
+from queue import Queue, Empty
+
+from .driver_pool import create_driver
+from .engines import ANSWER_SCRIPT, PAGE_LOAD_SECONDS, EngineError, capped
+from .metrics import Gauge, health_check
+
+BROWSER_TABS = int(os.environ.get("BROWSER_TABS", "4"))
+TAB_POLL_SECONDS = float(os.environ.get("TAB_POLL_SECONDS", "0.02"))
+
+# 📜 Page scripts, one round trip each. The marker set before a navigation or submit is gone once the
+# next document has replaced the page, so an old page (or old answer) is never mistaken for the new one.
+_NAVIGATE = "window.__lookupPending = true; window.location.href = arguments[0];"
+
+# null while the page is still loading, then whether it is the form page with its first field
+_FORM_READY = """
+if (window.__lookupPending || document.readyState === "loading") return null;
+return location.href === arguments[0] && !!document.getElementById(arguments[1]);
+"""
+
+_SUBMIT = """
+const [values, submitId, submitClass] = arguments;
+for (const [id, value] of Object.entries(values)) {
+    const field = document.getElementById(id);
+    field.value = value;
+    field.dispatchEvent(new Event("input", {bubbles: true}));
+    field.dispatchEvent(new Event("change", {bubbles: true}));
+}
+const submit = submitId ? document.getElementById(submitId) : document.getElementsByClassName(submitClass)[0];
+window.__lookupPending = true;
+setTimeout(() => submit.click(), 0);
+"""
+
+
+class _Request:
+    def __init__(self, form, form_url, args, timeout):
+        self.form = form
+        self.form_url = form_url
+        self.args = args
+        self.timeout = timeout
+        self.result = self.error = None
+        self.stage = self.deadline = self.started = None
+        self.done = threading.Event()
+
+    def finish(self, result=None, error=None):
+        self.result, self.error = result, error
+        self.done.set()
+
+
+class TabEngine:
+    name = "tabs"
+
+    # "none": chromedriver must not wait for one tab's navigation before talking to the next
+    def __init__(self, tabs=BROWSER_TABS, factory=functools.partial(create_driver, page_load_strategy="none")):
+        self.tabs = max(1, tabs)
+        self.workers = self.tabs  # run_lookups default: one worker thread per tab
+        self.factory = factory
+        self.driver = None
+        self.restarts = 0
+        self._requests = Queue()
+        self._busy = {}
+        self._free = []
+        self._thread = None
+        self._lock = threading.Lock()
+        atexit.register(self.close)
+
+    def lookup(self, form, form_url, *args, timeout=None):
+        request = _Request(form, form_url, args, timeout)
+        self._ensure_dispatcher()
+        self._requests.put(request)
+        request.done.wait()
+        if request.error is not None:
+            raise request.error
+        return request.result
+
+    def stats(self):
+        return {"tabs": self.tabs, "busy": len(self._busy), "queued": self._requests.qsize(),
+                "browser": self.driver is not None, "restarts": self.restarts}
+
+    def close(self):
+        driver, self.driver = self.driver, None
+        if driver is not None:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+    def _ensure_dispatcher(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._dispatch, name="tab-engine", daemon=True)
+                self._thread.start()
+
+    # 🔄 Dispatcher loop: fill free tabs, then advance every busy one
+    def _dispatch(self):
+        while True:
+            try:
+                if not self._busy:
+                    request = self._requests.get()
+                    try:
+                        self._start_browser()
+                    except Exception as e:
+                        request.finish(error=e)
+                        continue
+                    self._assign(request)
+                while self._free:
+                    try:
+                        self._assign(self._requests.get_nowait())
+                    except Empty:
+                        break
+                if not self._advance():
+                    time.sleep(TAB_POLL_SECONDS)
+            except Exception as e:
+                self._browser_failed(e)
+
+    def _start_browser(self):
+        if self.driver is not None:
+            return
+        self.driver = self.factory()
+        handles = [self.driver.current_window_handle]
+        while len(handles) < self.tabs:
+            self.driver.switch_to.new_window("tab")
+            handles.append(self.driver.current_window_handle)
+        self._free = handles
+
+    def _assign(self, request):
+        from selenium.common.exceptions import WebDriverException
+
+        tab = self._free.pop()
+        self._busy[tab] = request
+        request.started = time.monotonic()
+        try:
+            self.driver.switch_to.window(tab)
+            if self.driver.execute_script(_FORM_READY, request.form_url, request.form.fields[0]):
+                self._submit(request)  # the last answer page shows the form again: no reload
+            else:
+                request.stage = "loading"
+                request.deadline = request.started + capped(request.timeout, request.form.field_timeout)
+                self.driver.execute_script(_NAVIGATE, request.form_url)
+        except WebDriverException as e:
+            if not self._alive():
+                raise
+            self._release(tab, error=e)
+
+    def _submit(self, request):
+        form = request.form
+        self.driver.execute_script(_SUBMIT, form.values(request.args), form.submit_id, form.submit_class)
+        request.stage = "submitted"
+        request.deadline = time.monotonic() + capped(request.timeout, form.result_timeout)
+
+    # One pass over the busy tabs; True if any of them moved on
+    def _advance(self):
+        from selenium.common.exceptions import TimeoutException, WebDriverException
+
+        progressed = False
+        for tab, request in list(self._busy.items()):
+            form = request.form
+            try:
+                self.driver.switch_to.window(tab)
+                if request.stage == "loading":
+                    ready = self.driver.execute_script(_FORM_READY, request.form_url, form.fields[0])
+                    if ready:
+                        PAGE_LOAD_SECONDS.observe(time.monotonic() - request.started)
+                        self._submit(request)
+                        progressed = True
+                        continue
+                else:
+                    answer = self.driver.execute_script(ANSWER_SCRIPT, form.result_class)
+                    state, texts = answer or (None, [])
+                    # A fully loaded answer page without any match is an empty list, as on the HTTP engine
+                    if form.returns_list and (texts or state == "complete"):
+                        self._release(tab, texts)
+                        progressed = True
+                        continue
+                    if not form.returns_list and len(texts) > form.result_index:
+                        self._release(tab, texts[form.result_index].strip())
+                        progressed = True
+                        continue
+                if time.monotonic() >= request.deadline:
+                    # The page itself is slow: transient. A page that loaded without the form or the answer
+                    # is permanent, as on the selenium engine: a retry won't help.
+                    if (ready if request.stage == "loading" else answer) is None:
+                        error = TimeoutException(f"{request.form_url} did not load")
+                    elif request.stage == "loading":
+                        error = EngineError(f"No #{form.fields[0]} field on {request.form_url}")
+                    else:
+                        error = EngineError(f"No '{form.result_class}' answer on {request.form_url}")
+                    self._release(tab, error=error)
+                    progressed = True
+            except WebDriverException as e:
+                if not self._alive():
+                    raise
+                self._release(tab, error=e)  # this page only (script error, odd markup)
+                progressed = True
+        return progressed
+
+    def _release(self, tab, result=None, error=None):
+        request = self._busy.pop(tab)
+        self._free.append(tab)
+        request.finish(result, error)
+
+    def _alive(self):
+        try:
+            self.driver.current_window_handle
+            return True
+        except Exception:
+            return False
+
+    # 💥 Browser gone (or the loop broke): fail the lookups in flight, start a fresh browser on the next one
+    def _browser_failed(self, error):
+        for tab in list(self._busy):
+            self._release(tab, error=error)
+        self._free = []
+        self.close()
+        self.restarts += 1
+
+
+_tab_engine = None
+
+
+def tab_engine_stats():
+    return _tab_engine.stats() if _tab_engine is not None else None
+
+
+Gauge("browser_tabs_busy", "Tabs of the tab engine with a lookup in flight",
+      collect=lambda: {(): stats["busy"]} if (stats := tab_engine_stats()) else {})
+health_check("tab_engine", tab_engine_stats)
+
+
+def get_tab_engine():
+    global _tab_engine
+    if _tab_engine is None:
+        _tab_engine = TabEngine()
+    return _tab_engine
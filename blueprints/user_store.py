@@ -0,0 +1,187 @@
+# blueprints/user_store.py
+# ✅ The one place users.json is read and written: parsed once, indexed by user_id and pin,
+#    re-read only when the file changes on disk, saved atomically under a lock shared by all workers
+
+import os
+import json
+import time
+import hashlib
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+USERS_FILE = os.environ.get("USERS_FILE", os.path.join(BASE_DIR, "..", "users.json"))
+
+
+class UserStoreError(Exception):
+    pass
+
+
+# ⚠️ The user changed since the form was rendered (another admin, or another worker, saved first)
+class VersionConflict(UserStoreError):
+    pass
+
+
+# 🏷️ Version of one user record: a short hash of its content, so users.json needs no extra field
+def user_version(user):
+    return hashlib.sha1(json.dumps(user, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+
+
+# 🔒 Exclusive lock on users.json.lock, held across read-modify-write by every process
+class FileLock:
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+
+    def __enter__(self):
+        self._file = open(self.path, "a+")
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        else:
+            while True:
+                try:
+                    self._file.seek(0)
+                    msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:  # LK_LOCK gives up after ~10s; keep waiting
+                    time.sleep(0.1)
+        return self
+
+    def __exit__(self, *exc):
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        else:
+            self._file.seek(0)
+            msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+        self._file.close()
+        self._file = None
+
+
+class UserStore:
+    def __init__(self, path=USERS_FILE):
+        self.path = path
+        self._users = []
+        self._by_id = {}
+        self._by_pin = {}
+        self._signature = None
+        self._lock = threading.RLock()
+
+    def _stat(self):
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    # 🔄 Re-parse only when mtime/size changed (someone edited the file by hand, or another process saved).
+    # A file that does not parse is never read as "no users": keep serving the last good copy.
+    def _refresh(self, force=False):
+        signature = self._stat()
+        if signature == self._signature and not force:
+            return
+        users = []
+        if signature is not None:
+            with open(self.path, "r", encoding="utf-8") as f:
+                try:
+                    users = json.load(f)
+                except json.JSONDecodeError as e:
+                    if force or self._signature is None:
+                        raise UserStoreError(f"{self.path} is not valid JSON: {e}")
+                    print(f"🔴 {self.path} is not valid JSON, keeping the last good copy:", e)
+                    return
+        self._index(users, signature)
+
+    def _index(self, users, signature):
+        # First match wins, like the linear scans this replaces
+        self._users = users
+        self._by_id, self._by_pin = {}, {}
+        for u in users:
+            self._by_id.setdefault(u.get("user_id"), u)
+            if u.get("pin"):
+                self._by_pin.setdefault(u.get("pin"), u)
+        self._signature = signature
+
+    # Callers get copies, so editing a user dict never leaks into the cache without a save
+    def all(self):
+        with self._lock:
+            self._refresh()
+            return [dict(u) for u in self._users]
+
+    def get(self, user_id):
+        with self._lock:
+            self._refresh()
+            user = self._by_id.get(user_id)
+            return dict(user) if user else None
+
+    def get_by_pin(self, pin):
+        with self._lock:
+            self._refresh()
+            user = self._by_pin.get(pin)
+            return dict(user) if user else None
+
+    # 💾 Write to a temp file and rename over users.json, so readers never see half a file
+    def _write(self, users):
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(users, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self._index([dict(u) for u in users], self._stat())
+
+    # ✏️ Read-modify-write under the lock, always against the file as it is now on disk
+    def _modify(self, change):
+        with self._lock, FileLock(f"{self.path}.lock"):
+            self._refresh(force=True)
+            users = change([dict(u) for u in self._users])
+            if users is not None:
+                self._write(users)
+            return users is not None
+
+    def save(self, users):
+        self._modify(lambda current: users)
+
+    # ➕ False if the user_id is taken
+    def add(self, user):
+        def change(users):
+            if any(u.get("user_id") == user.get("user_id") for u in users):
+                return None
+            return users + [user]
+        return self._modify(change)
+
+    # ✏️ False if there is no such user; VersionConflict if `version` (from user_version) is stale
+    def update(self, user_id, changes, version=None):
+        def change(users):
+            for i, u in enumerate(users):
+                if u.get("user_id") == user_id:
+                    if version and user_version(u) != version:
+                        raise VersionConflict(f"User {user_id} was changed by someone else")
+                    users[i] = {**u, **changes}
+                    return users
+            return None
+        return self._modify(change)
+
+
+user_store = UserStore()
+
+
+# ✅ Module-level helpers used by the blueprints
+def load_users():
+    return user_store.all()
+
+
+def save_users(users):
+    user_store.save(users)
+
+
+def find_user(user_id):
+    return user_store.get(user_id)
+
+
+def find_user_by_pin(pin):
+    return user_store.get_by_pin(pin)